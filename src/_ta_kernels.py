@@ -0,0 +1,253 @@
+"""
+Numeric kernels for the per-tick indicator updates and the end-of-run trade summary.
+They are compiled to native code with numba (see requirements.txt). Without numba the
+scalar kernels run as plain Python and the batch kernels switch to NumPy versions,
+since their element loops are only fast when compiled.
+"""
+from typing import Tuple
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback used when numba is not installed: return the function unchanged"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def _rsi_value(avg_gain: float, avg_loss: float) -> float:
+    """RSI = 100 - (100 / (1 + RS)), where RS = Average Gain / Average Loss"""
+    if avg_loss == 0.0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+@njit(cache=True, fastmath=True)
+def _rsi_step(prev_avg_gain: float, prev_avg_loss: float, delta: float, n: int) -> Tuple[float, float, float]:
+    """
+    Apply one price change to Wilder's smoothed averages.
+    Returns the new average gain, average loss and RSI.
+    """
+    gain = delta if delta > 0.0 else 0.0
+    loss = -delta if delta < 0.0 else 0.0
+    avg_gain = (prev_avg_gain * (n - 1) + gain) / n
+    avg_loss = (prev_avg_loss * (n - 1) + loss) / n
+    return avg_gain, avg_loss, _rsi_value(avg_gain, avg_loss)
+
+
+@njit(cache=True, fastmath=True)
+def _ma_step(running_sum: float, new_price: float, old_price: float, n: int) -> Tuple[float, float]:
+    """
+    Add a price to a moving window sum and drop the evicted one.
+    Returns the new sum and the moving average over n prices.
+    """
+    running_sum += new_price - old_price
+    return running_sum, running_sum / n
+
+
+@njit(cache=True)
+def _ema_final_loop(prices: np.ndarray, period: int, k: float) -> float:
+    """
+    Return the last value of the exponential moving average over prices.
+    The EMA is seeded with the simple average of the first period prices and
+    k is the smoothing multiplier, normally 2/(period + 1). prices may be float32;
+    each price is widened to float64 before use, so the EMA is accumulated in float64.
+    """
+    ema = 0.0
+    for i in range(period):
+        ema += np.float64(prices[i])
+    ema /= period
+    for i in range(period, prices.shape[0]):
+        ema = np.float64(prices[i]) * k + ema * (1.0 - k)
+    return ema
+
+
+@njit(cache=True)
+def _pct_change_std_loop(prices: np.ndarray) -> float:
+    """
+    Return the population standard deviation of the percentage changes between
+    consecutive prices. prices may be float32; each price is widened to float64 before use.
+    """
+    n = prices.shape[0] - 1
+    mean = 0.0
+    for i in range(n):
+        prev = np.float64(prices[i])
+        mean += (np.float64(prices[i + 1]) - prev) / prev * 100.0
+    mean /= n
+    variance = 0.0
+    for i in range(n):
+        prev = np.float64(prices[i])
+        d = (np.float64(prices[i + 1]) - prev) / prev * 100.0 - mean
+        variance += d * d
+    return (variance / n) ** 0.5
+
+
+def _ema_final_numpy(prices: np.ndarray, period: int, k: float) -> float:
+    """
+    NumPy version of _ema_final_loop. Unrolling the recursion, the last EMA is the seed
+    decayed by (1 - k) per later price plus k times the later prices, each decayed by
+    the number of prices after it.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    later = prices[period:]
+    decay = (1.0 - k) ** np.arange(later.shape[0] - 1, -1, -1, dtype=np.float64)
+    return float(prices[:period].mean() * (1.0 - k) ** later.shape[0] + k * decay @ later)
+
+
+def _pct_change_std_numpy(prices: np.ndarray) -> float:
+    """NumPy version of _pct_change_std_loop"""
+    prices = np.asarray(prices, dtype=np.float64)
+    return float(np.std(np.diff(prices) / prices[:-1] * 100.0))
+
+
+if NUMBA_AVAILABLE:
+    ema_final, pct_change_std = _ema_final_loop, _pct_change_std_loop
+else:
+    ema_final, pct_change_std = _ema_final_numpy, _pct_change_std_numpy
+
+
+# The batch loop kernels and the kernels below are compiled without fastmath: the
+# streaming kernels use NaN to mark unseeded state, which fastmath lets numba assume never
+# occurs, and the batch kernels must not have their sums reassociated.
+
+# Slots of the streaming indicator state array. NaN marks a value that is not seeded yet;
+# the MACD count and sum accumulate the first MACD values until the signal EMA is seeded,
+# and the volatility sums cover the percentage changes inside the volatility window.
+(AVG_GAIN, AVG_LOSS, BB_SUM, BB_SUM_SQ, EMA_FAST, EMA_SLOW, EMA_SIGNAL, MACD_COUNT, MACD_SUM,
+ TREND_SHORT, TREND_MEDIUM, TREND_LONG, VOL_SUM, VOL_SUM_SQ) = range(14)
+STATE_SIZE = 14
+
+# Slots of the array returned by compute_all
+(RSI, MACD, MACD_SIGNAL, MACD_HISTOGRAM, BB_UPPER, BB_MIDDLE, BB_LOWER,
+ EMA_SHORT, EMA_MEDIUM, EMA_LONG, VOLATILITY) = range(11)
+RESULT_SIZE = 11
+
+
+def new_state() -> np.ndarray:
+    """Return an empty streaming indicator state"""
+    state = np.full(STATE_SIZE, np.nan)
+    state[BB_SUM] = state[BB_SUM_SQ] = 0.0
+    state[MACD_COUNT] = state[MACD_SUM] = 0.0
+    state[VOL_SUM] = state[VOL_SUM_SQ] = 0.0
+    return state
+
+
+@njit(cache=True)
+def update_state(state: np.ndarray, price: float, prev_price: float, evicted: float,
+                 rsi_period: int, k_fast: float, k_slow: float) -> None:
+    """
+    Fold one new price into the streaming state.
+    evicted is the price leaving the Bollinger window (0 while the window fills up);
+    averages that are not seeded yet are left untouched.
+    """
+    state[BB_SUM] += price - evicted
+    state[BB_SUM_SQ] += price * price - evicted * evicted
+    if not np.isnan(state[AVG_GAIN]):
+        state[AVG_GAIN], state[AVG_LOSS], _ = _rsi_step(state[AVG_GAIN], state[AVG_LOSS], price - prev_price, rsi_period)
+    if not np.isnan(state[EMA_FAST]):
+        state[EMA_FAST] = price * k_fast + state[EMA_FAST] * (1.0 - k_fast)
+    if not np.isnan(state[EMA_SLOW]):
+        state[EMA_SLOW] = price * k_slow + state[EMA_SLOW] * (1.0 - k_slow)
+
+
+@njit(cache=True)
+def update_trend(state: np.ndarray, price: float, pct_change: float, evicted_pct: float,
+                 k_short: float, k_medium: float, k_long: float) -> None:
+    """
+    Fold one new price into the trend EMAs and one percentage change into the volatility sums.
+    evicted_pct is the change leaving the volatility window (0 while the window fills up).
+    """
+    state[VOL_SUM] += pct_change - evicted_pct
+    state[VOL_SUM_SQ] += pct_change * pct_change - evicted_pct * evicted_pct
+    if not np.isnan(state[TREND_SHORT]):
+        state[TREND_SHORT] = price * k_short + state[TREND_SHORT] * (1.0 - k_short)
+    if not np.isnan(state[TREND_MEDIUM]):
+        state[TREND_MEDIUM] = price * k_medium + state[TREND_MEDIUM] * (1.0 - k_medium)
+    if not np.isnan(state[TREND_LONG]):
+        state[TREND_LONG] = price * k_long + state[TREND_LONG] * (1.0 - k_long)
+
+
+@njit(cache=True)
+def volatility(state: np.ndarray, n: int) -> float:
+    """Return the population standard deviation of the last n percentage changes"""
+    mean = state[VOL_SUM] / n
+    return max(state[VOL_SUM_SQ] / n - mean * mean, 0.0) ** 0.5
+
+
+@njit(cache=True)
+def macd_step(state: np.ndarray, signal_period: int, k_signal: float) -> Tuple[float, float, float]:
+    """
+    Take the next MACD value from the fast and slow EMAs and advance the signal EMA.
+    The signal is the MACD itself until signal_period values have been seen, then it is
+    seeded with their average. Returns the MACD, signal and histogram.
+    """
+    macd = state[EMA_FAST] - state[EMA_SLOW]
+    if np.isnan(state[EMA_SIGNAL]):
+        state[MACD_COUNT] += 1.0
+        state[MACD_SUM] += macd
+        if state[MACD_COUNT] < signal_period:
+            return macd, macd, 0.0
+        state[EMA_SIGNAL] = state[MACD_SUM] / signal_period
+    else:
+        state[EMA_SIGNAL] = macd * k_signal + state[EMA_SIGNAL] * (1.0 - k_signal)
+    signal = state[EMA_SIGNAL]
+    return macd, signal, macd - signal
+
+
+@njit(cache=True)
+def bollinger(state: np.ndarray, period: int, num_std: float) -> Tuple[float, float, float]:
+    """Return the upper, middle and lower bands from the running sums of the last period prices"""
+    middle = state[BB_SUM] / period
+    # Clamp rounding error that could make the variance negative
+    variance = max(state[BB_SUM_SQ] / period - middle * middle, 0.0)
+    std_dev = variance ** 0.5
+    return middle + std_dev * num_std, middle, middle - std_dev * num_std
+
+
+@njit(cache=True)
+def compute_all(state: np.ndarray, bb_period: int, bb_std_dev: float, volatility_window: int,
+                signal_period: int, k_signal: float) -> np.ndarray:
+    """
+    Calculate every indicator for the latest tick in one call.
+    All values come from the streaming state, so the cost does not depend on the history
+    length; the MACD signal is advanced by one value.
+    """
+    out = np.empty(RESULT_SIZE)
+    out[RSI] = _rsi_value(state[AVG_GAIN], state[AVG_LOSS])
+    out[MACD], out[MACD_SIGNAL], out[MACD_HISTOGRAM] = macd_step(state, signal_period, k_signal)
+    out[BB_UPPER], out[BB_MIDDLE], out[BB_LOWER] = bollinger(state, bb_period, bb_std_dev)
+    out[EMA_SHORT] = state[TREND_SHORT]
+    out[EMA_MEDIUM] = state[TREND_MEDIUM]
+    out[EMA_LONG] = state[TREND_LONG]
+    # volatility_window prices give volatility_window - 1 percentage changes
+    out[VOLATILITY] = volatility(state, volatility_window - 1)
+    return out
+
+
+@njit(cache=True)
+def trade_summary(trade_types: np.ndarray, profits: np.ndarray, sell_code: int) -> Tuple[int, int, int, float, float]:
+    """
+    Summarize a trade log in one pass.
+    Returns the number of sells, winning trades and losing trades, and the total profit
+    of the winners and of the losers. NaN profits (unknown P&L) count as neither.
+    The results are Python ints and floats whether or not the loop is compiled.
+    """
+    sells = wins = losses = 0
+    win_total = loss_total = 0.0
+    for i in range(profits.shape[0]):
+        if trade_types[i] == sell_code:
+            sells += 1
+        profit = float(profits[i])
+        if profit > 0.0:
+            wins += 1
+            win_total += profit
+        elif profit < 0.0:
+            losses += 1
+            loss_total += profit
+    return sells, wins, losses, win_total, loss_total
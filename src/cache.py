@@ -0,0 +1,137 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Cached API responses live under the working directory so each checkout keeps its own data
+CACHE_DIR = os.path.join(".cache", "robinhood")
+# Market data endpoints that were found to work, so later runs can skip probing
+ENDPOINTS_PATH = os.path.join(".cache", "endpoints.json")
+
+
+class TTLCache:
+    """
+    A small time-to-live cache for API responses.
+    Entries are kept in memory and, when a directory is configured, mirrored to JSON
+    files so that they survive between CLI invocations.
+    """
+    def __init__(self, directory: Optional[str] = CACHE_DIR, enabled: bool = True):
+        self.directory = directory
+        self.enabled = enabled
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def make_key(path: str, scope: str = "") -> str:
+        """
+        Build a cache key from a request path.
+        Query parameters are sorted so that the same set of symbols maps to the same key.
+        scope separates entries that differ by more than the path, such as the API key
+        the response belongs to.
+        """
+        base, _, query = path.partition("?")
+        if query:
+            base += "?" + "&".join(sorted(query.split("&")))
+        return hashlib.md5(f"{scope}\n{base}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Any:
+        """Return the cached value for a key, or None if it is missing or expired"""
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._load(key)
+            if entry is None:
+                return None
+            self._entries[key] = entry
+
+        if time.time() - entry["ts"] >= entry["ttl"]:
+            self._entries.pop(key, None)
+            return None
+
+        return entry["data"]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value for ttl seconds"""
+        if not self.enabled:
+            return
+
+        entry = {"ts": time.time(), "ttl": ttl, "data": value}
+        self._entries[key] = entry
+
+        if self.directory:
+            # Write to a temporary file and move it into place, so a concurrent reader or an
+            # interrupted write never sees a partial entry
+            path = self._entry_path(key)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(tmp_path, "w") as f:
+                    json.dump(entry, f)
+                os.replace(tmp_path, path)
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning("Could not write cache entry: %s", e)
+
+    def invalidate(self, key: str) -> None:
+        """Remove a single entry from memory and disk"""
+        self._entries.pop(key, None)
+        if self.directory:
+            try:
+                os.remove(self._entry_path(key))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("Could not remove cache entry: %s", e)
+
+    def clear(self) -> None:
+        """Remove all cached entries from memory and disk"""
+        self._entries.clear()
+        if self.directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read an entry from disk, ignoring missing or corrupt files"""
+        if not self.directory:
+            return None
+
+        try:
+            with open(self._entry_path(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(entry, dict) or not {"ts", "ttl", "data"} <= entry.keys():
+            return None
+        return entry
+
+
+# Shared by every client in the process; the CLI toggles or clears it
+DEFAULT_CACHE = TTLCache()
+
+
+def load_endpoints(path: str = ENDPOINTS_PATH) -> Dict[str, str]:
+    """Load the saved endpoint map, returning an empty map if it is missing or corrupt"""
+    try:
+        with open(path) as f:
+            endpoints = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return endpoints if isinstance(endpoints, dict) else {}
+
+
+def save_endpoints(endpoints: Dict[str, str], path: str = ENDPOINTS_PATH) -> None:
+    """Write the endpoint map to disk"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(endpoints, f)
+    except OSError as e:
+        logger.warning("Could not save endpoint cache: %s", e)
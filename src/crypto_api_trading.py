@@ -1,264 +1,429 @@
+import atexit
 import base64
-import datetime
-import json
-from typing import Any, Dict, Optional
+from binascii import b2a_base64
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import logging
+from operator import itemgetter
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 import uuid
-import requests
+import urllib3
+from urllib3.util.retry import Retry
 from nacl.signing import SigningKey
 import os
 from dotenv import load_dotenv
+from src.cache import DEFAULT_CACHE, TTLCache, load_endpoints, save_endpoints
+
+# orjson is considerably faster at both parsing and serializing; fall back to the
+# standard library when it is not installed
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 API_KEY = os.getenv("API_KEY")
 BASE64_PRIVATE_KEY = os.getenv("BASE64_PRIVATE_KEY")
 
+# How long (in seconds) slowly-changing responses are served from the cache
+ACCOUNT_CACHE_TTL = 300
+TRADING_PAIRS_CACHE_TTL = 24 * 60 * 60  # The list of tradable pairs changes over weeks
+HOLDINGS_CACHE_TTL = 60
+
+# Upper bound on requests fired at once by fetch_concurrently; matches the connection pool size
+MAX_CONCURRENT_REQUESTS = 16
+
+# Cached paths whose responses change when an order is placed or cancelled
+ACCOUNT_PATH = "/api/v1/crypto/trading/accounts/"
+HOLDINGS_PATH = "/api/v1/crypto/trading/holdings/"
+
+# Number of client order ids generated per batch by next_client_order_id
+CLIENT_ORDER_ID_BATCH = 64
+
+# Pre-encoded method verbs and request paths used when signing requests. Paths are
+# encoded on first use; the path map is capped so per-order paths cannot grow it forever
+_METHOD_BYTES = {"GET": b"GET", "POST": b"POST"}
+_PATH_CACHE: Dict[str, bytes] = {}
+_PATH_CACHE_MAX = 256
+
+
+def _dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to UTF-8 encoded JSON.
+    orjson already returns bytes; the stdlib fallback returns a str that needs encoding.
+    """
+    serialized = _json.dumps(obj)
+    return serialized if isinstance(serialized, bytes) else serialized.encode("utf-8")
+
+
+# Field names to read bid/ask prices from, in order of preference. A single 'price'
+# field is used for both sides when no side-specific price is present.
+_BID_KEYS = ("bid_inclusive_of_sell_spread", "bid_price", "price")
+_ASK_KEYS = ("ask_inclusive_of_buy_spread", "ask_price", "price")
+_QUOTE_PASSTHROUGH_KEYS = ("symbol", "timestamp")
+_get_bid_ask = itemgetter('bid_price', 'ask_price')
+
+# Candidate market data paths, tried in order until one returns a recognizable response
+BEST_BID_ASK_PATHS = (
+    "/api/v1/crypto/marketdata/best_bid_ask/",
+    "/api/v1/crypto/quotes/",
+    "/api/v1/crypto/marketdata/quotes/",
+)
+ESTIMATED_PRICE_PATHS = (
+    "/api/v1/crypto/marketdata/estimated_price/",
+    "/api/v1/crypto/price_estimates/",
+    "/api/v1/crypto/marketdata/price_estimates/",
+)
+
+
+def _adapt_quote(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a quote from the 'results' response format to the best_bid_ask format our code uses"""
+    adapted_item = {key: item[key] for key in _QUOTE_PASSTHROUGH_KEYS if key in item}
+
+    bid = next((item[key] for key in _BID_KEYS if key in item), None)
+    if bid is not None:
+        adapted_item['bid_price'] = bid
+
+    ask = next((item[key] for key in _ASK_KEYS if key in item), None)
+    if ask is not None:
+        adapted_item['ask_price'] = ask
+
+    return adapted_item
+
+
+def _adapt_best_bid_ask(result: Any) -> Optional[Dict[str, Any]]:
+    """Convert a bid/ask response to the {'best_bid_ask': [...]} format, or None if unrecognized"""
+    if not result or not isinstance(result, dict) or result.get('error'):
+        return None
+
+    # The format we're seeing now: {'results': [{...}]}
+    if result.get('results'):
+        logger.debug("Found 'results' key in response, adapting to expected format")
+        return {'best_bid_ask': [_adapt_quote(item) for item in result['results']]}
+    if 'best_bid_ask' in result:
+        return result
+    if 'quotes' in result:
+        return {'best_bid_ask': result['quotes']}
+    if 'data' in result:
+        return {'best_bid_ask': result['data']}
+    return None
+
+
+def _adapt_estimated_price(result: Any, side: str) -> Optional[Dict[str, Any]]:
+    """Convert an estimated price response to a standardized format, or None if unrecognized"""
+    if not result or not isinstance(result, dict) or result.get('error'):
+        return None
+
+    if 'estimated_price' in result or 'price' in result:
+        return result
+    if not result.get('results'):
+        return None
+
+    logger.debug("Found 'results' key in estimated price response, adapting format")
+    estimated_prices = []
+    for item in result['results']:
+        # Include all original fields for reference
+        price_item = dict(item)
+
+        # Make sure we have a standardized 'price' field
+        if 'price' not in price_item and 'bid_inclusive_of_sell_spread' in item and 'ask_inclusive_of_buy_spread' in item:
+            # For 'both' side, calculate the midpoint
+            bid = float(item['bid_inclusive_of_sell_spread'])
+            ask = float(item['ask_inclusive_of_buy_spread'])
+            price_item['price'] = str((bid + ask) / 2)
+
+        estimated_prices.append(price_item)
+
+    return {
+        'estimated_price': estimated_prices[0]['price'] if side != 'both' else None,
+        'bid_price': next((item['price'] for item in estimated_prices if item.get('side') == 'bid'), None),
+        'ask_price': next((item['price'] for item in estimated_prices if item.get('side') == 'ask'), None),
+        'prices': estimated_prices  # Keep the full details for reference
+    }
+
+
+def parse_best_bid_ask(response: Any) -> Optional[Tuple[float, float]]:
+    """
+    Return the (bid, ask) prices of the first quote in a best_bid_ask response as floats,
+    or None if the response has no quote with both prices
+    """
+    if not isinstance(response, dict) or not response.get('best_bid_ask'):
+        return None
+    try:
+        bid, ask = _get_bid_ask(response['best_bid_ask'][0])
+        return float(bid), float(ask)
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+
+
+# Market data endpoints learned by any client in this process, not yet saved
+_learned_endpoints: Dict[str, str] = {}
+
+
+def _save_learned_endpoints() -> None:
+    """
+    Merge the endpoints learned in this process into the saved map, so endpoints that
+    another process learned meanwhile are kept
+    """
+    if _learned_endpoints:
+        endpoints = load_endpoints()
+        endpoints.update(_learned_endpoints)
+        save_endpoints(endpoints)
+        _learned_endpoints.clear()
+
+
+# One hook for the whole process, however many clients are created
+atexit.register(_save_learned_endpoints)
 
 
 class CryptoAPITrading:
-    def __init__(self):
+    def __init__(self, cache: Optional[TTLCache] = None):
         self.api_key = API_KEY
         private_key_seed = base64.b64decode(BASE64_PRIVATE_KEY)
         self.private_key = SigningKey(private_key_seed)
+        # The key never changes, so encode it once for every signature
+        self._api_key_bytes = (self.api_key or "").encode("utf-8")
+        self._api_key_header = {"x-api-key": self.api_key}
         self.base_url = "https://trading.robinhood.com"
 
+        # Once the retries run out, hand back the last error response instead of raising, so
+        # its JSON body still reaches the caller
+        retries = Retry(
+            total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False
+        )
+        # Talk to urllib3's keep-alive connection pool directly; repeated calls skip the
+        # TCP/TLS handshake without the per-call overhead of a requests Session
+        self.pool = urllib3.connection_from_url(
+            self.base_url, maxsize=MAX_CONCURRENT_REQUESTS, block=False, retries=retries, timeout=10
+        )
+
+        # Account, trading pair and holdings data change slowly, so cache them briefly
+        self.cache = cache if cache is not None else DEFAULT_CACHE
+        # Account and holdings paths requested so far; their entries are dropped after orders
+        self._balance_paths = {ACCOUNT_PATH, HOLDINGS_PATH}
+
+        # Market data endpoints that worked before, keyed by "bid_ask" / "est_price"
+        self._endpoint_cache: Dict[str, str] = load_endpoints()
+
+        # Pre-generated client order ids, refilled in batches
+        self._client_order_ids: List[str] = []
+
+    def close(self) -> None:
+        """Close the connection pool and release its connections, and save learned endpoints"""
+        self.pool.close()
+        _save_learned_endpoints()
+
+    def next_client_order_id(self) -> str:
+        """
+        Return a new random (version 4) UUID to use as a client order id.
+        Ids are generated in batches from a single os.urandom call.
+        """
+        if not self._client_order_ids:
+            random_bytes = os.urandom(16 * CLIENT_ORDER_ID_BATCH)
+            self._client_order_ids = [
+                str(uuid.UUID(bytes=random_bytes[i:i + 16], version=4)) for i in range(0, len(random_bytes), 16)
+            ]
+        return self._client_order_ids.pop()
+
+    def fetch_concurrently(
+            self, calls: Dict[str, Tuple[Callable[..., Any], Tuple[Any, ...]]]
+    ) -> Dict[str, Any]:
+        """
+        Run independent API calls at the same time over the pooled connections, so the
+        total wait is the slowest call rather than the sum of all of them.
+        calls maps a name to a (method, args) pair; results are returned under the same names.
+        A call that raises is logged and returns None, so one failure does not discard the
+        other results.
+        """
+        if not calls:
+            return {}
+
+        results: Dict[str, Any] = {}
+        with ThreadPoolExecutor(max_workers=min(len(calls), MAX_CONCURRENT_REQUESTS)) as executor:
+            futures = {name: executor.submit(func, *args) for name, (func, args) in calls.items()}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    logger.error("Concurrent call %s failed: %s", name, e)
+                    results[name] = None
+        return results
+
     @staticmethod
     def _get_current_timestamp() -> int:
-        return int(datetime.datetime.now(tz=datetime.timezone.utc).timestamp())
+        # Epoch seconds are timezone independent, so no datetime object is needed
+        return int(time.time())
 
     @staticmethod
-    def get_query_params(key: str, *args: Optional[str]) -> str:
+    @functools.lru_cache(maxsize=128)
+    def get_query_params(key: str, args: Tuple[Optional[str], ...]) -> str:
+        """
+        Build a query string such as "?symbol=BTC-USD&symbol=ETH-USD".
+        Results are memoized because polling loops request the same symbols every tick.
+        """
         if not args:
             return ""
 
-        params = []
-        for arg in args:
-            params.append(f"{key}={arg}")
+        return "?" + "&".join(f"{key}={arg}" for arg in args)
+
+    def make_api_request(
+            self, method: str, path: str, body: Union[str, bytes, Dict[str, Any]] = "", cache_ttl: Optional[float] = None
+    ) -> Any:
+        # Serve cacheable GET requests without a network round-trip when possible
+        cache_key = None
+        if cache_ttl and method == "GET" and self.cache.enabled:
+            cache_key = self._cache_key(path)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Using cached response for %s", path)
+                return cached
 
-        return "?" + "&".join(params)
+        # Serialize the body exactly once; the same bytes are signed and sent
+        if isinstance(body, dict):
+            body_bytes = _dumps(body)
+        elif isinstance(body, str):
+            body_bytes = body.encode("utf-8")
+        else:
+            body_bytes = body
 
-    def make_api_request(self, method: str, path: str, body: str = "") -> Any:
         timestamp = self._get_current_timestamp()
-        headers = self.get_authorization_header(method, path, body, timestamp)
+        headers = self.get_authorization_header(method, path, body_bytes, timestamp)
         url = self.base_url + path
 
-        print(f"Making {method} request to {url}")
+        logger.debug("Making %s request to %s", method, url)
         
         try:
-            response = {}
-            if method == "GET":
-                response = requests.get(url, headers=headers, timeout=10)
-            elif method == "POST":
-                response = requests.post(url, headers=headers, json=json.loads(body) if body else {}, timeout=10)
+            if method == "POST":
+                headers["Content-Type"] = "application/json"
+                response = self.pool.request(method, path, headers=headers, body=body_bytes or b"{}")
+            else:
+                response = self.pool.request(method, path, headers=headers)
             
-            # Print response details for debugging
-            print(f"Response status code: {response.status_code}")
-            if response.status_code != 200:
-                print(f"Error response text: {response.text}")
+            logger.debug("Response status code: %s", response.status)
+            if response.status != 200:
+                logger.warning(
+                    "Error response from %s (%s): %s", path, response.status, response.data.decode("utf-8", "replace")
+                )
             
             # Check if we can parse the response as JSON
             try:
-                return response.json()
-            except json.JSONDecodeError as json_err:
-                print(f"Failed to decode JSON: {json_err}")
-                print(f"Response text: {response.text}")
+                result = _json.loads(response.data)
+            except ValueError as json_err:
+                logger.warning("Failed to decode JSON: %s", json_err)
+                logger.warning("Response text: %s", response.data.decode("utf-8", "replace"))
                 return None
+
+            if cache_key and response.status == 200:
+                self.cache.set(cache_key, result, cache_ttl)
+            return result
                 
-        except requests.RequestException as e:
-            print(f"Error making API request: {e}")
+        except urllib3.exceptions.HTTPError as e:
+            logger.error("Error making API request: %s", e)
             return None
 
     def get_authorization_header(
-            self, method: str, path: str, body: str, timestamp: int
+            self, method: str, path: str, body: Union[str, bytes], timestamp: int
     ) -> Dict[str, str]:
-        message_to_sign = f"{self.api_key}{timestamp}{path}{method}{body}"
-        signed = self.private_key.sign(message_to_sign.encode("utf-8"))
+        timestamp_str = str(timestamp)
+        path_bytes = _PATH_CACHE.get(path)
+        if path_bytes is None:
+            path_bytes = path.encode("utf-8")
+            if len(_PATH_CACHE) < _PATH_CACHE_MAX:
+                _PATH_CACHE[path] = path_bytes
+        message_to_sign = b"".join((
+            self._api_key_bytes,
+            timestamp_str.encode("ascii"),
+            path_bytes,
+            _METHOD_BYTES.get(method) or method.encode("ascii"),
+            body.encode("utf-8") if isinstance(body, str) else body,
+        ))
+        signed = self.private_key.sign(message_to_sign)
 
         return {
-            "x-api-key": self.api_key,
-            "x-signature": base64.b64encode(signed.signature).decode("utf-8"),
-            "x-timestamp": str(timestamp),
+            **self._api_key_header,
+            "x-signature": b2a_base64(signed.signature, newline=False).decode("ascii"),
+            "x-timestamp": timestamp_str,
         }
 
-    def get_account(self) -> Any:
-        path = "/api/v1/crypto/trading/accounts/"
-        return self.make_api_request("GET", path)
+    def _cache_key(self, path: str) -> str:
+        """Cache key for a path, scoped to this client's API key so accounts never share entries"""
+        return self.cache.make_key(path, self.api_key or "")
+
+    def _invalidate_balances(self) -> None:
+        """Drop cached account and holdings responses, which change once an order goes through"""
+        for path in tuple(self._balance_paths):
+            self.cache.invalidate(self._cache_key(path))
+
+    # Pass cached=False where the balance gates an order; the cached response may be minutes old
+    def get_account(self, cached: bool = True) -> Any:
+        return self.make_api_request("GET", ACCOUNT_PATH, cache_ttl=ACCOUNT_CACHE_TTL if cached else None)
 
     # The symbols argument must be formatted in trading pairs, e.g "BTC-USD", "ETH-USD". If no symbols are provided,
     # all supported symbols will be returned
     def get_trading_pairs(self, *symbols: Optional[str]) -> Any:
-        query_params = self.get_query_params("symbol", *symbols)
+        query_params = self.get_query_params("symbol", symbols)
         path = f"/api/v1/crypto/trading/trading_pairs/{query_params}"
-        return self.make_api_request("GET", path)
+        return self.make_api_request("GET", path, cache_ttl=TRADING_PAIRS_CACHE_TTL)
 
     # The asset_codes argument must be formatted as the short form name for a crypto, e.g "BTC", "ETH". If no asset
-    # codes are provided, all crypto holdings will be returned
-    def get_holdings(self, *asset_codes: Optional[str]) -> Any:
-        query_params = self.get_query_params("asset_code", *asset_codes)
-        path = f"/api/v1/crypto/trading/holdings/{query_params}"
-        return self.make_api_request("GET", path)
+    # codes are provided, all crypto holdings will be returned. As with get_account, pass cached=False
+    # where the holdings gate an order
+    def get_holdings(self, *asset_codes: Optional[str], cached: bool = True) -> Any:
+        query_params = self.get_query_params("asset_code", asset_codes)
+        path = f"{HOLDINGS_PATH}{query_params}"
+        self._balance_paths.add(path)
+        return self.make_api_request("GET", path, cache_ttl=HOLDINGS_CACHE_TTL if cached else None)
 
     # The symbols argument must be formatted in trading pairs, e.g "BTC-USD", "ETH-USD". If no symbols are provided,
     # the best bid and ask for all supported symbols will be returned
     def get_best_bid_ask(self, *symbols: Optional[str]) -> Any:
-        query_params = self.get_query_params("symbol", *symbols)
-        
-        # Try with the original path
-        path = f"/api/v1/crypto/marketdata/best_bid_ask/{query_params}"
-        print(f"Attempting to get best bid/ask with path: {path}")
-        result = self.make_api_request("GET", path)
-        
-        # Check if the result has the format we're seeing now: {'results': [{...}]}
-        if result and isinstance(result, dict) and 'results' in result and result['results']:
-            print("Found 'results' key in response, adapting to expected format...")
-            
-            # Convert to the expected format that our code uses
-            best_bid_ask_items = []
-            
-            for item in result['results']:
-                # Create a mapping from the new format to our expected format
-                adapted_item = {}
-                
-                if 'symbol' in item:
-                    adapted_item['symbol'] = item['symbol']
-                
-                # Map the new price fields to our expected format
-                if 'bid_inclusive_of_sell_spread' in item:
-                    adapted_item['bid_price'] = item['bid_inclusive_of_sell_spread']
-                elif 'bid_price' in item:
-                    adapted_item['bid_price'] = item['bid_price']
-                
-                if 'ask_inclusive_of_buy_spread' in item:
-                    adapted_item['ask_price'] = item['ask_inclusive_of_buy_spread']
-                elif 'ask_price' in item:
-                    adapted_item['ask_price'] = item['ask_price']
-                
-                # If we only have a single price, use it for both bid and ask
-                if 'price' in item and (not 'bid_price' in adapted_item or not 'ask_price' in adapted_item):
-                    if not 'bid_price' in adapted_item:
-                        adapted_item['bid_price'] = item['price']
-                    if not 'ask_price' in adapted_item:
-                        adapted_item['ask_price'] = item['price']
-                
-                # Add timestamp if available
-                if 'timestamp' in item:
-                    adapted_item['timestamp'] = item['timestamp']
-                
-                best_bid_ask_items.append(adapted_item)
-            
-            return {'best_bid_ask': best_bid_ask_items}
-        
-        # If that format isn't found, try some alternative endpoints
-        if not result or (isinstance(result, dict) and 'best_bid_ask' not in result):
-            print("First attempt failed, trying alternative endpoint...")
-            
-            # Try alternative endpoints
-            alt_paths = [
-                f"/api/v1/crypto/quotes/{query_params}",
-                f"/api/v1/crypto/marketdata/quotes/{query_params}"
-            ]
-            
-            for alt_path in alt_paths:
-                print(f"Trying alternative path: {alt_path}")
-                alt_result = self.make_api_request("GET", alt_path)
-                
-                # If we get a valid-looking response, process it
-                if alt_result and isinstance(alt_result, dict) and not alt_result.get('error'):
-                    print(f"Alternative path {alt_path} returned: {alt_result.keys() if isinstance(alt_result, dict) else 'Not a dictionary'}")
-                    
-                    # Check for different response formats
-                    if 'quotes' in alt_result:
-                        return {'best_bid_ask': alt_result['quotes']}
-                    elif 'data' in alt_result:
-                        return {'best_bid_ask': alt_result['data']}
-                    elif 'results' in alt_result and alt_result['results']:
-                        # Process as above
-                        best_bid_ask_items = []
-                        for item in alt_result['results']:
-                            adapted_item = {}
-                            if 'symbol' in item:
-                                adapted_item['symbol'] = item['symbol']
-                            if 'bid_inclusive_of_sell_spread' in item:
-                                adapted_item['bid_price'] = item['bid_inclusive_of_sell_spread']
-                            elif 'bid_price' in item:
-                                adapted_item['bid_price'] = item['bid_price']
-                            if 'ask_inclusive_of_buy_spread' in item:
-                                adapted_item['ask_price'] = item['ask_inclusive_of_buy_spread']
-                            elif 'ask_price' in item:
-                                adapted_item['ask_price'] = item['ask_price']
-                            if 'price' in item and (not 'bid_price' in adapted_item or not 'ask_price' in adapted_item):
-                                if not 'bid_price' in adapted_item:
-                                    adapted_item['bid_price'] = item['price']
-                                if not 'ask_price' in adapted_item:
-                                    adapted_item['ask_price'] = item['price']
-                            if 'timestamp' in item:
-                                adapted_item['timestamp'] = item['timestamp']
-                            best_bid_ask_items.append(adapted_item)
-                        return {'best_bid_ask': best_bid_ask_items}
-                    
-                    # If we can't adapt the format, just return it
-                    return alt_result
-        
-        return result
+        query_params = self.get_query_params("symbol", symbols)
+        return self._request_learned_endpoint("bid_ask", BEST_BID_ASK_PATHS, query_params, _adapt_best_bid_ask)
 
     # The symbol argument must be formatted in a trading pair, e.g "BTC-USD", "ETH-USD"
     # The side argument must be "bid", "ask", or "both".
     # Multiple quantities can be specified in the quantity argument, e.g. "0.1,1,1.999".
     def get_estimated_price(self, symbol: str, side: str, quantity: str) -> Any:
-        # Original path
-        path = f"/api/v1/crypto/marketdata/estimated_price/?symbol={symbol}&side={side}&quantity={quantity}"
-        print(f"Attempting to get estimated price with path: {path}")
-        result = self.make_api_request("GET", path)
-        
-        # Check if the response has the new format with 'results' key
-        if result and isinstance(result, dict) and 'results' in result and result['results']:
-            print("Found 'results' key in estimated price response, adapting format...")
-            
-            # Create a standardized format response
-            estimated_prices = []
-            
-            for item in result['results']:
-                price_item = {}
-                
-                # Include all original fields for reference
-                price_item.update(item)
-                
-                # Make sure we have a standardized 'price' field
-                if 'price' not in price_item and 'bid_inclusive_of_sell_spread' in item and 'ask_inclusive_of_buy_spread' in item:
-                    # For 'both' side, calculate the midpoint
-                    bid = float(item['bid_inclusive_of_sell_spread'])
-                    ask = float(item['ask_inclusive_of_buy_spread'])
-                    price_item['price'] = str((bid + ask) / 2)
-                
-                estimated_prices.append(price_item)
-            
-            return {
-                'estimated_price': estimated_prices[0]['price'] if side != 'both' else None,
-                'bid_price': next((item['price'] for item in estimated_prices if item.get('side') == 'bid'), None),
-                'ask_price': next((item['price'] for item in estimated_prices if item.get('side') == 'ask'), None),
-                'prices': estimated_prices  # Keep the full details for reference
-            }
-            
-        # If we didn't find the expected format, try some alternative endpoints
-        if not result or (isinstance(result, dict) and ('estimated_price' not in result and 'price' not in result and 'results' not in result)):
-            print("First attempt failed, trying alternative endpoint...")
-            
-            # Try alternative endpoints
-            alt_paths = [
-                f"/api/v1/crypto/price_estimates/?symbol={symbol}&side={side}&quantity={quantity}",
-                f"/api/v1/crypto/marketdata/price_estimates/?symbol={symbol}&side={side}&quantity={quantity}"
-            ]
-            
-            for alt_path in alt_paths:
-                print(f"Trying alternative path: {alt_path}")
-                alt_result = self.make_api_request("GET", alt_path)
-                
-                # If we get a valid-looking response, return it
-                if alt_result and isinstance(alt_result, dict) and not alt_result.get('error'):
-                    print(f"Alternative path {alt_path} returned: {alt_result.keys() if isinstance(alt_result, dict) else 'Not a dictionary'}")
-                    return alt_result
-        
-        return result
+        query_params = f"?symbol={symbol}&side={side}&quantity={quantity}"
+        return self._request_learned_endpoint(
+            "est_price", ESTIMATED_PRICE_PATHS, query_params, lambda result: _adapt_estimated_price(result, side)
+        )
+
+    def _request_learned_endpoint(
+            self, endpoint: str, base_paths: Tuple[str, ...], query_params: str,
+            adapt: Callable[[Any], Optional[Dict[str, Any]]]
+    ) -> Any:
+        """
+        Request the first of several candidate paths whose response can be adapted.
+        The path that worked last time is tried first, so in the steady state only one
+        request is made. Returns the first raw response if no path gives a usable one.
+        """
+        learned_path = self._endpoint_cache.get(endpoint)
+        if learned_path in base_paths:
+            base_paths = (learned_path,) + tuple(p for p in base_paths if p != learned_path)
+
+        first_result = None
+        for attempt, base_path in enumerate(base_paths):
+            path = f"{base_path}{query_params}"
+            logger.debug("Attempting %s request with path: %s", endpoint, path)
+            result = self.make_api_request("GET", path)
+            if attempt == 0:
+                first_result = result
+
+            adapted = adapt(result)
+            if adapted is not None:
+                if base_path != learned_path:
+                    self._endpoint_cache[endpoint] = base_path
+                    _learned_endpoints[endpoint] = base_path
+                return adapted
+
+            logger.debug("Unrecognized response from %s, trying alternative endpoint", path)
+
+        return first_result
 
     def place_order(
             self,
@@ -276,11 +441,15 @@ class CryptoAPITrading:
             f"{order_type}_order_config": order_config,
         }
         path = "/api/v1/crypto/trading/orders/"
-        return self.make_api_request("POST", path, json.dumps(body))
+        result = self.make_api_request("POST", path, body)
+        self._invalidate_balances()
+        return result
 
     def cancel_order(self, order_id: str) -> Any:
         path = f"/api/v1/crypto/trading/orders/{order_id}/cancel/"
-        return self.make_api_request("POST", path)
+        result = self.make_api_request("POST", path)
+        self._invalidate_balances()
+        return result
 
     def get_order(self, order_id: str) -> Any:
         path = f"/api/v1/crypto/trading/orders/{order_id}/"
@@ -299,7 +468,7 @@ def main():
     BUILD YOUR TRADING STRATEGY HERE
 
     order = api_trading_client.place_order(
-          str(uuid.uuid4()),
+          api_trading_client.next_client_order_id(),
           "buy",
           "market",
           "BTC-USD",
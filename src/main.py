@@ -1,6 +1,10 @@
 import argparse
+import logging
+import os
+from typing import List, Optional
 from src.trading_strategies import run_strategy
 from src.crypto_api_trading import CryptoAPITrading
+from src.cache import DEFAULT_CACHE
 from src.xrp_trading import run_xrp_strategy
 from test_api_functionality import test_api_functionality
 
@@ -57,8 +61,13 @@ def list_holdings():
     else:
         print("Failed to fetch holdings or no holdings available")
 
-def main():
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser with all subcommands"""
     parser = argparse.ArgumentParser(description='Robinhood Crypto Trading Bot')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Show debug logging, including every API request')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always fetch fresh data instead of using cached API responses')
     subparsers = parser.add_subparsers(dest='command', help='Command to run')
     
     # List available trading pairs
@@ -72,7 +81,7 @@ def main():
     strategy_parser.add_argument('--strategy', '-s', required=True, choices=['sma', 'rsi'], 
                                 help='Trading strategy to use (sma=Simple Moving Average, rsi=Relative Strength Index)')
     strategy_parser.add_argument('--symbol', '-sym', required=True, 
-                                help='Trading pair symbol (e.g., BTC-USD)')
+                                help='Trading pair symbol, or comma-separated symbols (e.g., BTC-USD or BTC-USD,ETH-USD)')
     strategy_parser.add_argument('--quantity', '-q', required=True, 
                                 help='Quantity to trade (e.g., 0.0001)')
     strategy_parser.add_argument('--interval', '-i', type=int, default=60, 
@@ -91,12 +100,43 @@ def main():
     
     # Test API functionality
     test_parser = subparsers.add_parser('test-api', help='Test all API functionality')
-    test_parser.add_argument('--verbose', '-v', action='store_true', help='Show detailed response information')
+    test_parser.add_argument('--verbose', '-v', action='store_true', default=argparse.SUPPRESS,
+                             help='Show detailed response information')
     
     # Account information
     account_parser = subparsers.add_parser('account', help='Get account information')
     
-    args = parser.parse_args()
+    # Cache maintenance
+    subparsers.add_parser('clear-cache', help='Delete cached API responses')
+    
+    return parser
+
+
+# Log level used when LOG_LEVEL is unset or not a valid level name
+DEFAULT_LOG_LEVEL = "INFO"
+
+# Built once at import so repeated calls to main() reuse the same parser
+_PARSER = _build_parser()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Parse command-line arguments (sys.argv by default) and run the selected command"""
+    args = _PARSER.parse_args(argv)
+    
+    # Debug output is only formatted and written when verbose logging is requested; the
+    # INFO default keeps placed orders and their P&L visible
+    if args.verbose:
+        log_level = "DEBUG"
+    else:
+        log_level = os.getenv("LOG_LEVEL", DEFAULT_LOG_LEVEL).upper()
+        # getLevelName maps known level names to their number and echoes anything else back
+        if not isinstance(logging.getLevelName(log_level), int):
+            print(f"Unknown LOG_LEVEL {log_level!r}, using {DEFAULT_LOG_LEVEL}")
+            log_level = DEFAULT_LOG_LEVEL
+    logging.basicConfig(level=log_level, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    
+    if args.no_cache:
+        DEFAULT_CACHE.enabled = False
     
     if args.command == 'list-pairs':
         list_available_pairs()
@@ -133,8 +173,11 @@ def main():
         account = client.get_account()
         print("\nAccount Information:")
         print(account)
+    elif args.command == 'clear-cache':
+        DEFAULT_CACHE.clear()
+        print("Cleared cached API responses")
     else:
-        parser.print_help()
+        _PARSER.print_help()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,28 +1,86 @@
+import asyncio
 import time
-import uuid
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from src.crypto_api_trading import CryptoAPITrading
+from src._ta_kernels import _ma_step, _rsi_step, _rsi_value
+
+class PriceFeed:
+    """
+    Shared source of best bid/ask quotes.
+    Strategies register their symbols and the feed fetches quotes for all of them
+    with a single API request per tick instead of one request per strategy.
+    """
+    def __init__(self, client: CryptoAPITrading):
+        self.client = client
+        self.symbols: List[str] = []
+        self.quotes: Dict[str, Tuple[float, float]] = {}  # symbol -> (bid, ask)
+    
+    def register(self, symbol: str) -> None:
+        """Add a symbol to the set of quotes fetched on each refresh"""
+        if symbol not in self.symbols:
+            self.symbols.append(symbol)
+    
+    def refresh(self) -> Dict[str, Tuple[float, float]]:
+        """Fetch the latest quotes for every registered symbol in one request"""
+        self.quotes = {}
+        if not self.symbols:
+            return self.quotes
+        
+        result = self.client.get_best_bid_ask(*self.symbols)
+        if not result or 'best_bid_ask' not in result:
+            return self.quotes
+        
+        for item in result['best_bid_ask']:
+            # A response for a single symbol may not echo the symbol back
+            symbol = item.get('symbol') or (self.symbols[0] if len(self.symbols) == 1 else None)
+            if symbol is None:
+                continue
+            try:
+                self.quotes[symbol] = (float(item['bid_price']), float(item['ask_price']))
+            except (KeyError, TypeError, ValueError):
+                print(f"Could not parse quote for {symbol}: {item}")
+        return self.quotes
+    
+    def get_quote(self, symbol: str) -> Optional[Tuple[float, float]]:
+        """Return the (bid, ask) pair from the last refresh, or None if unavailable"""
+        return self.quotes.get(symbol)
+
 
 class SimpleMovingAverageStrategy:
-    def __init__(self, client: CryptoAPITrading, symbol: str, quantity: str):
+    def __init__(self, client: CryptoAPITrading, symbol: str, quantity: str, price_feed: Optional[PriceFeed] = None):
         self.client = client
         self.symbol = symbol
         self.quantity = quantity
-        self.price_history = []
+        
+        # Without a shared feed the strategy refreshes its own quotes every tick
+        self._owns_feed = price_feed is None
+        self.price_feed = price_feed if price_feed is not None else PriceFeed(client)
+        self.price_feed.register(symbol)
         self.ma_period = 5  # 5-point moving average
+        # Only the most recent prices are needed; the deque drops the oldest automatically
+        self.price_history = deque(maxlen=self.ma_period)
+        self._running_sum = 0.0  # Sum of the prices currently in price_history
+        self._moving_avg = 0.0
         
     def collect_price_data(self):
         """Collect price data for the moving average calculation"""
         # In a real strategy, you'd collect historical data
         # For this example, we'll just get the current price
-        result = self.client.get_best_bid_ask(self.symbol)
-        if result and 'best_bid_ask' in result and len(result['best_bid_ask']) > 0:
-            current_price = float(result['best_bid_ask'][0]['ask_price'])
-            self.price_history.append(current_price)
+        if self._owns_feed:
+            self.price_feed.refresh()
+        
+        quote = self.price_feed.get_quote(self.symbol)
+        if quote:
+            current_price = quote[1]  # Ask price
             
-            # Keep only the most recent prices for our moving average
-            if len(self.price_history) > self.ma_period:
-                self.price_history.pop(0)
-                
+            # Update the running sum with the new price and the one about to be evicted
+            evicted = self.price_history[0] if len(self.price_history) == self.ma_period else 0.0
+            self.price_history.append(current_price)
+            self._running_sum, self._moving_avg = _ma_step(
+                self._running_sum, current_price, evicted, self.ma_period
+            )
             return current_price
         return None
     
@@ -30,7 +88,7 @@ class SimpleMovingAverageStrategy:
         """Calculate the moving average from collected price data"""
         if len(self.price_history) < self.ma_period:
             return None
-        return sum(self.price_history) / len(self.price_history)
+        return self._moving_avg
     
     def execute(self):
         """Execute the trading strategy"""
@@ -41,7 +99,7 @@ class SimpleMovingAverageStrategy:
             print("Not enough data to execute strategy")
             return
         
-        print(f"Current price: {current_price}, Moving Average: {moving_avg}")
+        print(f"{self.symbol} current price: {current_price}, Moving Average: {moving_avg}")
         
         # Simple strategy: Buy if price is below MA, Sell if price is above MA
         if current_price < moving_avg * 0.98:  # Price is 2% below MA - potential buy
@@ -55,11 +113,15 @@ class SimpleMovingAverageStrategy:
         else:
             print("No trading signal")
     
+    async def execute_async(self):
+        """Execute the strategy in a worker thread so other strategies keep running meanwhile"""
+        await asyncio.to_thread(self.execute)
+    
     def _place_buy_order(self):
         """Place a buy order"""
         print(f"Placing buy order for {self.quantity} of {self.symbol}")
         order = self.client.place_order(
-            str(uuid.uuid4()),
+            self.client.next_client_order_id(),
             "buy",
             "market",
             self.symbol,
@@ -72,7 +134,7 @@ class SimpleMovingAverageStrategy:
         """Place a sell order"""
         print(f"Placing sell order for {self.quantity} of {self.symbol}")
         order = self.client.place_order(
-            str(uuid.uuid4()),
+            self.client.next_client_order_id(),
             "sell",
             "market",
             self.symbol,
@@ -83,43 +145,141 @@ class SimpleMovingAverageStrategy:
 
 
 class RSIStrategy:
-    """A simple Relative Strength Index (RSI) strategy"""
-    def __init__(self, client: CryptoAPITrading, symbol: str, quantity: str):
+    """
+    A simple Relative Strength Index (RSI) strategy.
+    Uses Wilder's smoothing so that each tick after warm-up updates the RSI in O(1).
+    """
+    def __init__(self, client: CryptoAPITrading, symbol: str, quantity: str, price_feed: Optional[PriceFeed] = None):
         self.client = client
         self.symbol = symbol
         self.quantity = quantity
-        self.price_history = []
+        self._owns_feed = price_feed is None
+        self.price_feed = price_feed if price_feed is not None else PriceFeed(client)
+        self.price_feed.register(symbol)
         self.rsi_period = 14
         self.overbought_threshold = 70
         self.oversold_threshold = 30
         
-    # Implementation of RSI calculation and trading logic would go here
-    # For brevity, this is just a placeholder
+        # Ring buffer of recent prices; _head is the next slot to write
+        self.price_history = np.empty(self.rsi_period * 4, dtype=np.float64)
+        self._head = 0
+        self._count = 0
+        
+        # Wilder's smoothed average gain and loss, seeded once enough prices are collected
+        self._avg_gain: Optional[float] = None
+        self._avg_loss: Optional[float] = None
+    
+    def collect_price_data(self) -> Optional[float]:
+        """Collect the current ask price and add it to the ring buffer"""
+        if self._owns_feed:
+            self.price_feed.refresh()
+        
+        quote = self.price_feed.get_quote(self.symbol)
+        if not quote:
+            return None
+        
+        current_price = quote[1]  # Ask price
+        self.price_history[self._head] = current_price
+        self._head = (self._head + 1) % len(self.price_history)
+        self._count += 1
+        return current_price
+    
+    def _recent_prices(self) -> np.ndarray:
+        """Return the buffered prices in chronological order"""
+        if self._count < len(self.price_history):
+            return self.price_history[:self._count]
+        return np.roll(self.price_history, -self._head)
+    
+    def calculate_rsi(self) -> Optional[float]:
+        """
+        Calculate the RSI from Wilder's smoothed average gain and loss
+        RSI = 100 - (100 / (1 + RS)), where RS = Average Gain / Average Loss
+        """
+        n = self.rsi_period
+        if self._avg_gain is None:
+            if self._count < n + 1:
+                return None
+            
+            # Seed the averages with the simple mean of the first n price changes
+            deltas = np.diff(self._recent_prices()[-(n + 1):])
+            self._avg_gain = float(np.maximum(deltas, 0.0).mean())
+            self._avg_loss = float(np.maximum(-deltas, 0.0).mean())
+            return _rsi_value(self._avg_gain, self._avg_loss)
+        
+        # Negative indices wrap around to the end of the ring buffer
+        delta = float(self.price_history[self._head - 1] - self.price_history[self._head - 2])
+        self._avg_gain, self._avg_loss, rsi = _rsi_step(self._avg_gain, self._avg_loss, delta, n)
+        return rsi
     
     def execute(self):
-        print("RSI Strategy not fully implemented yet")
+        """Execute the trading strategy"""
+        current_price = self.collect_price_data()
+        if current_price is None:
+            print("Not enough data to execute strategy")
+            return
+        
+        rsi = self.calculate_rsi()
+        if rsi is None:
+            print("Not enough data to execute strategy")
+            return
+        
+        print(f"{self.symbol} current price: {current_price}, RSI: {rsi:.2f}")
+        
+        if rsi < self.oversold_threshold:
+            print(f"Buy signal: RSI ({rsi:.2f}) is below {self.oversold_threshold}")
+        elif rsi > self.overbought_threshold:
+            print(f"Sell signal: RSI ({rsi:.2f}) is above {self.overbought_threshold}")
+        else:
+            print("No trading signal")
+    
+    async def execute_async(self):
+        """Execute the strategy in a worker thread so other strategies keep running meanwhile"""
+        await asyncio.to_thread(self.execute)
+
+
+async def run_strategy_async(strategies: List, price_feed: PriceFeed, interval: int = 60):
+    """
+    Run strategies concurrently on one event loop
+    
+    Each tick refreshes the shared price feed once, then executes every strategy at the
+    same time so that slow network calls (such as order placement) don't hold up the others.
+    """
+    while True:
+        print(f"\n--- {time.strftime('%Y-%m-%d %H:%M:%S')} ---")
+        await asyncio.to_thread(price_feed.refresh)
+        await asyncio.gather(*(strategy.execute_async() for strategy in strategies))
+        await asyncio.sleep(interval)
 
 
 def run_strategy(strategy_name: str, symbol: str, quantity: str, interval: int = 60):
-    """Run a trading strategy at specified intervals"""
+    """
+    Run a trading strategy at specified intervals
+    
+    Args:
+        strategy_name: Strategy to run ("sma" or "rsi")
+        symbol: Trading pair, or several comma-separated pairs (e.g. "BTC-USD,ETH-USD")
+        quantity: Quantity to trade for each symbol
+        interval: Seconds between each strategy execution
+    """
     client = CryptoAPITrading()
+    symbols = [s.strip() for s in symbol.split(",") if s.strip()]
+    
+    # All strategies share one feed so each tick costs a single quote request
+    price_feed = PriceFeed(client)
     
     # Select strategy
     if strategy_name.lower() == "sma":
-        strategy = SimpleMovingAverageStrategy(client, symbol, quantity)
+        strategies = [SimpleMovingAverageStrategy(client, s, quantity, price_feed) for s in symbols]
     elif strategy_name.lower() == "rsi":
-        strategy = RSIStrategy(client, symbol, quantity)
+        strategies = [RSIStrategy(client, s, quantity, price_feed) for s in symbols]
     else:
         raise ValueError(f"Unknown strategy: {strategy_name}")
     
-    print(f"Starting {strategy_name} strategy for {symbol} with quantity {quantity}")
+    print(f"Starting {strategy_name} strategy for {', '.join(symbols)} with quantity {quantity}")
     print(f"Checking at {interval} second intervals")
     print("Press Ctrl+C to stop")
     
     try:
-        while True:
-            print(f"\n--- {time.strftime('%Y-%m-%d %H:%M:%S')} ---")
-            strategy.execute()
-            time.sleep(interval)
+        asyncio.run(run_strategy_async(strategies, price_feed, interval))
     except KeyboardInterrupt:
         print("\nStrategy execution stopped by user")
\ No newline at end of file
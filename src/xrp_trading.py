@@ -1,8 +1,162 @@
+import logging
+import sys
 import time
-import uuid
-from datetime import datetime
-from typing import List, Dict, Any
-from src.crypto_api_trading import CryptoAPITrading
+import traceback
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, Deque, Dict, Any, List, NamedTuple, Optional, Sequence, Union
+import numpy as np
+from src.crypto_api_trading import CryptoAPITrading, parse_best_bid_ask
+from src import _ta_kernels as ta
+
+logger = logging.getLogger(__name__)
+
+# Random source for synthetic prices; noise is drawn in batches of SYNTHETIC_NOISE_BATCH
+_RNG = np.random.default_rng()
+SYNTHETIC_NOISE_BATCH = 4096
+
+# Recompute the Bollinger and volatility running sums from scratch this often to stop rounding drift
+SUM_RESYNC_INTERVAL = 10_000
+
+# Storage type of the price ring buffer. XRP prices carry about six significant digits, so
+# float32 holds them exactly enough; indicator state stays float64 to avoid accumulated error
+PRICE_DTYPE = np.float32
+
+# Minimum confidence needed to act on a signal; sells need less than buys (risk management)
+BUY_CONFIDENCE_MIN = 0.6
+SELL_CONFIDENCE_MIN = 0.5
+
+# Trade log: codes stored in the trade type array, and the initial number of trade slots
+TRADE_BUY, TRADE_SELL = 0, 1
+TRADE_TYPES = ("buy", "sell")
+INITIAL_TRADE_CAPACITY = 64
+
+# Signal scoring rules, in evaluation order:
+#   RSI extreme, RSI approaching extreme, MACD crossover, MACD momentum,
+#   price at Bollinger Band, EMA trend (and, for sells, high volatility).
+# Each rule that fires adds its weight to the signal count and its confidence to the
+# side's confidence; rules with a reason template are reported when they fire.
+BUY_WEIGHTS = np.array([1.0, 0.5, 1.0, 0.5, 1.0, 0.5])
+BUY_CONFIDENCE = np.array([0.2, 0.1, 0.2, 0.1, 0.15, 0.1])
+BUY_REASONS = (
+    "RSI ({rsi:.2f}) indicates oversold condition",
+    None,
+    "MACD bullish crossover detected",
+    None,
+    "Price at lower Bollinger Band (support level)",
+    "Confirmed uptrend provides favorable buying conditions",
+)
+SELL_WEIGHTS = np.array([1.0, 0.5, 1.0, 0.5, 1.0, 0.5, 0.5])
+SELL_CONFIDENCE = np.array([0.2, 0.1, 0.2, 0.1, 0.15, 0.1, 0.1])
+SELL_REASONS = (
+    "RSI ({rsi:.2f}) indicates overbought condition",
+    None,
+    "MACD bearish crossover detected",
+    None,
+    "Price at upper Bollinger Band (resistance level)",
+    "Confirmed downtrend suggests selling",
+    "Extremely high volatility ({volatility:.2f}%)",
+)
+# The trend rule is only reported when the signals up to and including it exceed this count
+TREND_RULE = 5
+TREND_REASON_MIN_SIGNALS = 1.5
+
+
+# Known best bid/ask item shapes: (required fields, price extractor, description).
+# The first shape that matches a response is remembered and used directly afterwards.
+BEST_BID_ASK_SHAPES = (
+    (("bid_price", "ask_price"),
+     lambda item: (float(item['bid_price']) + float(item['ask_price'])) / 2,
+     "bid_price/ask_price"),
+    (("price",),
+     lambda item: float(item['price']),
+     "price field"),
+    (("bid_inclusive_of_sell_spread", "ask_inclusive_of_buy_spread"),
+     lambda item: (float(item['bid_inclusive_of_sell_spread']) + float(item['ask_inclusive_of_buy_spread'])) / 2,
+     "bid/ask_inclusive_of_spread"),
+)
+
+# Known estimated price response shapes, matched the same way
+ESTIMATED_PRICE_SHAPES = (
+    (lambda result: 'estimated_price' in result,
+     lambda result: float(result['estimated_price'])),
+    (lambda result: 'price' in result,
+     lambda result: float(result['price'])),
+    (lambda result: isinstance(result.get('data'), list) and result['data'] and result['data'][0].get('price'),
+     lambda result: float(result['data'][0]['price'])),
+)
+
+# Holding fields that may carry the XRP quantity, in order of preference
+HOLDING_QUANTITY_FIELDS = ('total_quantity', 'quantity', 'quantity_available_for_trading')
+
+
+def _fired_reasons(conditions: np.ndarray, weights: np.ndarray, templates: Sequence[Optional[str]],
+                   **values: float) -> List[str]:
+    """Format the reason templates of the rules that fired"""
+    reasons = []
+    for i in np.flatnonzero(conditions):
+        template = templates[i]
+        if template is None:
+            continue
+        if i == TREND_RULE and conditions[:i + 1] @ weights[:i + 1] <= TREND_REASON_MIN_SIGNALS:
+            continue
+        reasons.append(template.format(**values))
+    return reasons
+
+
+class MarketSnapshot(NamedTuple):
+    """
+    Result of one analyze_market call.
+    Indicator fields are NaN (and trend empty) while not enough data has been collected.
+    """
+    price: float
+    signal: str
+    reason: str
+    confidence: float
+    buy_signals: float = 0.0
+    sell_signals: float = 0.0
+    rsi: float = np.nan
+    macd: float = np.nan
+    macd_signal: float = np.nan
+    macd_hist: float = np.nan
+    bb_upper: float = np.nan
+    bb_mid: float = np.nan
+    bb_lower: float = np.nan
+    ema_short: float = np.nan
+    ema_medium: float = np.nan
+    ema_long: float = np.nan
+    volatility: float = np.nan
+    trend: str = ""
+    support_resistance: Optional[Dict[str, Any]] = None
+    
+    @property
+    def has_indicators(self) -> bool:
+        """Whether enough data was collected to calculate the indicators"""
+        return self.support_resistance is not None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the analysis as nested dicts, grouped the same way as the indicator methods"""
+        if not self.has_indicators:
+            return {"price": self.price, "indicators": {}, "signal": self.signal,
+                    "reason": self.reason, "confidence": self.confidence}
+        return {
+            "price": self.price,
+            "indicators": {
+                "rsi": self.rsi,
+                "macd": {"macd": self.macd, "signal": self.macd_signal, "histogram": self.macd_hist},
+                "bollinger_bands": {"upper": self.bb_upper, "middle": self.bb_mid, "lower": self.bb_lower},
+                "emas": {"short": self.ema_short, "medium": self.ema_medium, "long": self.ema_long},
+                "volatility": self.volatility,
+                "trend": self.trend,
+                "support_resistance": self.support_resistance
+            },
+            "signal": self.signal,
+            "reason": self.reason,
+            "confidence": self.confidence,
+            "buy_signals": self.buy_signals,
+            "sell_signals": self.sell_signals
+        }
+
 
 class XRPTradingStrategy:
     """
@@ -14,13 +168,8 @@ class XRPTradingStrategy:
         self.client = client
         self.symbol = symbol
         self.quantity = quantity
-        self.price_history: List[float] = []
-        self.time_history: List[datetime] = []
-        self.volume_history: List[float] = []  # Track trading volumes if available
-        
         # RSI settings
         self.rsi_period = 14
-        self.rsi_values: List[float] = []
         self.overbought_threshold = 70  # RSI value considered overbought
         self.oversold_threshold = 30    # RSI value considered oversold
         
@@ -28,41 +177,126 @@ class XRPTradingStrategy:
         self.macd_fast = 12             # Fast EMA period
         self.macd_slow = 26             # Slow EMA period
         self.macd_signal = 9            # Signal line period
-        self.macd_values: List[float] = []
-        self.macd_signal_values: List[float] = []
-        self.macd_histogram: List[float] = []
         
         # Bollinger Bands settings
         self.bb_period = 20             # Bollinger Bands period
         self.bb_std_dev = 2             # Number of standard deviations
-        self.bb_upper: List[float] = []
-        self.bb_middle: List[float] = []
-        self.bb_lower: List[float] = []
         
         # Other technical indicators
         self.volatility_window = 20     # Window to calculate volatility
         self.ema_short = 9              # Short exponential moving average
         self.ema_medium = 21            # Medium exponential moving average
         self.ema_long = 50              # Long exponential moving average
-        self.ema_short_values: List[float] = []
-        self.ema_medium_values: List[float] = []
-        self.ema_long_values: List[float] = []
         
         # Trading parameters
         self.min_data_points = max(self.rsi_period, self.bb_period, self.macd_slow + self.macd_signal, self.volatility_window, self.ema_long) + 1
         self.profit_target = 0.03       # 3% profit target
         self.stop_loss = 0.02           # 2% stop loss
         self.max_position_size = 20     # Maximum XRP units to trade at once
+        self.min_tick = 1e-4            # Relative price moves smaller than this reuse the last signal (0 disables)
+        
+        # Recent prices live in a preallocated ring buffer; _price_count is the total number
+        # recorded, so the next write goes to slot _price_count % _cap
+        self._cap = self.min_data_points
+        self._prices = np.empty(self._cap, dtype=PRICE_DTYPE)
+        self._price_count = 0
+        
+        # Sliding windows of recent values; each deque drops its oldest entry automatically
+        self.tick_times_ns: Deque[int] = deque(maxlen=self.min_data_points)  # Tick times, see wall_time
+        self.volume_history: Deque[float] = deque(maxlen=self.min_data_points)  # Track trading volumes if available
+        self.rsi_values: Deque[float] = deque(maxlen=self.rsi_period)
+        self.macd_values: Deque[float] = deque(maxlen=self.macd_slow)
+        self.macd_signal_values: Deque[float] = deque(maxlen=self.macd_signal)
+        self.macd_histogram: Deque[float] = deque(maxlen=self.macd_signal)
+        self.bb_upper: Deque[float] = deque(maxlen=self.bb_period)
+        self.bb_middle: Deque[float] = deque(maxlen=self.bb_period)
+        self.bb_lower: Deque[float] = deque(maxlen=self.bb_period)
+        self.ema_short_values: Deque[float] = deque(maxlen=self.ema_short)
+        self.ema_medium_values: Deque[float] = deque(maxlen=self.ema_medium)
+        self.ema_long_values: Deque[float] = deque(maxlen=self.ema_long)
+        
+        # Streaming indicator state (see src/_ta_kernels.py for the layout): Wilder's RSI
+        # averages, Bollinger and volatility running sums and the MACD and trend EMAs,
+        # updated one price at a time
+        self._state = ta.new_state()
+        self._rsi_warmup_count = 0
+        self._sum_updates = 0
+        
+        # EMA multipliers k = 2/(period + 1) for every period the strategy uses
+        self._ema_k = {
+            period: 2 / (period + 1)
+            for period in (self.macd_fast, self.macd_slow, self.macd_signal,
+                           self.ema_short, self.ema_medium, self.ema_long)
+        }
+        
+        # (state slot, period) of the streaming EMAs still waiting for their first period
+        # prices, in the order they become ready
+        self._ema_seeds = sorted(
+            [(ta.EMA_FAST, self.macd_fast), (ta.EMA_SLOW, self.macd_slow), (ta.TREND_SHORT, self.ema_short),
+             (ta.TREND_MEDIUM, self.ema_medium), (ta.TREND_LONG, self.ema_long)],
+            key=lambda seed: seed[1]
+        )
+        
+        # Price extractors for the response shapes seen so far, resolved on first use
+        self._extract_price: Optional[Callable[[Dict[str, Any]], float]] = None
+        self._price_source = ""
+        self._extract_est_price: Optional[Callable[[Dict[str, Any]], float]] = None
+        
+        # Pre-drawn relative price changes for synthetic prices; refilled when used up
+        self._synth_noise = np.empty(0)
+        self._synth_idx = 0
+        
+        # Times are kept as monotonic nanoseconds since the strategy was created and only
+        # converted to wall-clock datetimes for reporting (see wall_time)
+        self._t0_wall = datetime.now()
+        self._t0_ns = time.monotonic_ns()
+        
+        # Price and time from the latest analyze_market call, reused when recording
+        # prices and placing orders
+        self._last_analyzed_price = 0.0
+        self._tick_ns = 0
+        
+        # Latest analysis whose signal was scored and the (position size, last buy price) it was
+        # made with; its signal is reused while the price stays within min_tick of its price
+        self._last_analysis: Optional[MarketSnapshot] = None
+        self._last_analysis_position = (0, 0)
+        
+        # Indicator results for the current tick, keyed by name. _memo_count is the
+        # _price_count they were computed at; a new price invalidates them.
+        self._memo: Dict[str, Dict[str, float]] = {}
+        self._memo_count = -1
+        
+        # execute() actions indexed by action code: hold, buy, sell
+        self._actions = (self._hold, self._buy, self._sell)
         
         # Trade tracking
         self.last_buy_price = 0
         self.last_sell_price = 0
         self.position_size = 0
-        self.trade_history = []
         self.profit_loss = 0            # Track P&L
         
+        # Trade log as parallel arrays, one slot per trade. The first _n_trades slots are in
+        # use; profit is NaN for buys and for sells without a known buy price.
+        self._n_trades = 0
+        self._trade_time_ns = np.empty(INITIAL_TRADE_CAPACITY, dtype=np.int64)
+        self._trade_type = np.empty(INITIAL_TRADE_CAPACITY, dtype=np.int8)
+        self._trade_price = np.empty(INITIAL_TRADE_CAPACITY, dtype=np.float64)
+        self._trade_qty = np.empty(INITIAL_TRADE_CAPACITY, dtype=np.float64)
+        self._trade_profit = np.empty(INITIAL_TRADE_CAPACITY, dtype=np.float64)
+        self._trade_profit_pct = np.empty(INITIAL_TRADE_CAPACITY, dtype=np.float64)
+        
     def collect_price_data(self) -> float:
         """Collect the current price data for XRP"""
+        current_price = self._fetch_price()
+        if current_price is None:
+            return 0
+        
+        # Add to our price history
+        self._record_price(current_price)
+        return current_price
+    
+    def _fetch_price(self) -> Optional[float]:
+        """Fetch the current XRP price without recording it; None if no price is available"""
         # Try multiple methods to get price data in case some API endpoints are unavailable
         
         # Method 1: Try get_best_bid_ask
@@ -73,168 +307,261 @@ class XRPTradingStrategy:
             try:
                 item = result['best_bid_ask'][0]
                 
-                # Use the midpoint of bid and ask as the current price
-                if 'bid_price' in item and 'ask_price' in item:
-                    bid_price = float(item['bid_price'])
-                    ask_price = float(item['ask_price'])
-                    current_price = (bid_price + ask_price) / 2
-                    print(f"Got price from bid_price/ask_price: {current_price}")
-                    
-                # If we only have a 'price' field
-                elif 'price' in item:
-                    current_price = float(item['price'])
-                    print(f"Got price from price field: {current_price}")
-                    
-                # If we have different field names
-                elif 'bid_inclusive_of_sell_spread' in item and 'ask_inclusive_of_buy_spread' in item:
-                    bid_price = float(item['bid_inclusive_of_sell_spread'])
-                    ask_price = float(item['ask_inclusive_of_buy_spread'])
-                    current_price = (bid_price + ask_price) / 2
-                    print(f"Got price from bid/ask_inclusive_of_spread: {current_price}")
-                    
-                else:
-                    print(f"Could not extract price from item: {item}")
-                    raise KeyError("No price fields found in response")
-                
-                # Add to our price history
-                self.price_history.append(current_price)
-                self.time_history.append(datetime.now())
+                # Reuse the extractor for the shape seen last time; if its fields are
+                # missing the response shape changed, so resolve it again
+                current_price = None
+                if self._extract_price is not None:
+                    try:
+                        current_price = self._extract_price(item)
+                    except KeyError:
+                        self._extract_price = None
                 
-                # Keep only the data we need for our calculations
-                if len(self.price_history) > self.min_data_points:
-                    self.price_history.pop(0)
-                    self.time_history.pop(0)
+                if self._extract_price is None:
+                    for fields, extract, source in BEST_BID_ASK_SHAPES:
+                        if all(field in item for field in fields):
+                            self._extract_price, self._price_source = extract, source
+                            break
+                    else:
+                        logger.warning("Could not extract price from item: %s", item)
+                        raise KeyError("No price fields found in response")
                     
+                    # Bid/ask shapes use the midpoint of bid and ask as the current price
+                    current_price = self._extract_price(item)
+                
+                logger.debug("Got price from %s: %s", self._price_source, current_price)
                 return current_price
             except (KeyError, ValueError, TypeError, IndexError) as e:
-                print(f"Error parsing best_bid_ask response: {e}")
-                print(f"Response structure: {result}")
+                logger.warning("Error parsing best_bid_ask response: %s", e)
+                logger.debug("Response structure: %s", result)
                 # Continue to try other methods
         
         # Method 2: Try get_estimated_price
-        print("Trying to get price from estimated_price endpoint...")
+        logger.debug("Trying to get price from estimated_price endpoint...")
         try:
             est_result = self.client.get_estimated_price(self.symbol, "both", "1.0")
             
             if est_result:
-                print(f"Estimated price response: {est_result}")
+                logger.debug("Estimated price response: %s", est_result)
                 
-                # Try different possible response formats
-                if 'estimated_price' in est_result:
-                    current_price = float(est_result['estimated_price'])
-                elif 'price' in est_result:
-                    current_price = float(est_result['price'])
-                elif 'data' in est_result and est_result['data']:
-                    # Might be structured as data[0]['price']
-                    if isinstance(est_result['data'], list) and est_result['data'][0].get('price'):
-                        current_price = float(est_result['data'][0]['price'])
-                    else:
-                        return 0
-                else:
-                    return 0
-                
-                print(f"Got price from estimated_price: {current_price}")
+                # Reuse the extractor for the shape seen last time
+                current_price = None
+                if self._extract_est_price is not None:
+                    try:
+                        current_price = self._extract_est_price(est_result)
+                    except (KeyError, IndexError):
+                        self._extract_est_price = None
                 
-                # Add to our price history
-                self.price_history.append(current_price)
-                self.time_history.append(datetime.now())
-                
-                # Keep only the data we need for our calculations
-                if len(self.price_history) > self.min_data_points:
-                    self.price_history.pop(0)
-                    self.time_history.pop(0)
+                # Otherwise try different possible response formats, e.g. data[0]['price']
+                if self._extract_est_price is None:
+                    for matches, extract in ESTIMATED_PRICE_SHAPES:
+                        if matches(est_result):
+                            self._extract_est_price = extract
+                            break
+                    else:
+                        return None
                     
+                    current_price = self._extract_est_price(est_result)
+                
+                logger.debug("Got price from estimated_price: %s", current_price)
                 return current_price
         except Exception as e:
-            print(f"Error getting estimated_price: {e}")
+            logger.warning("Error getting estimated_price: %s", e)
         
         # Method 3: If nothing else works, try a synthetic price generation for testing
         # This is only for simulation purposes when API is unavailable
-        if self.price_history:
+        if self._price_count:
             # Generate a slightly modified price based on last price
-            import random
-            last_price = self.price_history[-1]
-            fluctuation = last_price * random.uniform(-0.005, 0.005)  # Random 0.5% change
-            synthetic_price = last_price + fluctuation
-            
-            print(f"Warning: Using synthetic price generation: {synthetic_price}")
+            if self._synth_idx >= len(self._synth_noise):
+                self._synth_noise = _RNG.uniform(-0.005, 0.005, SYNTHETIC_NOISE_BATCH)  # Random 0.5% changes
+                self._synth_idx = 0
+            last_price = float(self._price_at(1))
+            fluctuation = last_price * self._synth_noise[self._synth_idx]
+            self._synth_idx += 1
+            synthetic_price = float(last_price + fluctuation)
             
-            self.price_history.append(synthetic_price)
-            self.time_history.append(datetime.now())
-            
-            if len(self.price_history) > self.min_data_points:
-                self.price_history.pop(0)
-                self.time_history.pop(0)
-                
+            logger.warning("Using synthetic price generation: %s", synthetic_price)
             return synthetic_price
         else:
             # First price - use a reasonable placeholder for XRP
             synthetic_price = 0.50  # Example XRP price in USD
-            print(f"Warning: Using placeholder price for first data point: {synthetic_price}")
-            self.price_history.append(synthetic_price)
-            self.time_history.append(datetime.now())
+            logger.warning("Using placeholder price for first data point: %s", synthetic_price)
             return synthetic_price
     
+    def _record_price(self, price: float) -> None:
+        """Append a price to the history and fold it into the streaming indicator state"""
+        # Round to the buffer precision first so the Bollinger sums match what is evicted later
+        price = float(PRICE_DTYPE(price))
+        state = self._state
+        count = self._price_count
+        rsi_period, bb_period = self.rsi_period, self.bb_period
+        fast, slow = self.macd_fast, self.macd_slow
+        k = self._ema_k
+        
+        prev_price = float(self._price_at(1)) if count else price
+        evicted = float(self._price_at(bb_period)) if count >= bb_period else 0.0
+        if count and np.isnan(state[ta.AVG_GAIN]):
+            self._rsi_warmup_count += 1
+        
+        ta.update_state(state, price, prev_price, evicted, rsi_period, k[fast], k[slow])
+        
+        # Percentage change into the volatility window, and the one leaving it
+        vol_window = self.volatility_window
+        pct_change = (price - prev_price) / prev_price * 100.0 if count else 0.0
+        evicted_pct = 0.0
+        if count >= vol_window:
+            older = float(self._price_at(vol_window))
+            evicted_pct = (float(self._price_at(vol_window - 1)) - older) / older * 100.0
+        ta.update_trend(state, price, pct_change, evicted_pct, k[self.ema_short], k[self.ema_medium], k[self.ema_long])
+        
+        self._prices[count % self._cap] = price
+        count += 1
+        self._price_count = count
+        self.tick_times_ns.append(self._tick_ns)
+        
+        # Seed each EMA with the simple average of its first period prices
+        seeds = self._ema_seeds
+        while seeds and seeds[0][1] <= count:
+            slot, period = seeds.pop(0)
+            state[slot] = self.prices_view()[-period:].mean(dtype=np.float64)
+        
+        if np.isnan(state[ta.AVG_GAIN]) and self._rsi_warmup_count == rsi_period:
+            # Seed the averages with the simple mean of the first rsi_period price changes
+            deltas = np.diff(self.prices_view().astype(np.float64))
+            state[ta.AVG_GAIN] = np.maximum(deltas, 0.0).mean()
+            state[ta.AVG_LOSS] = np.maximum(-deltas, 0.0).mean()
+        
+        self._sum_updates += 1
+        if self._sum_updates % SUM_RESYNC_INTERVAL == 0:
+            prices = self.prices_view().astype(np.float64)
+            window = prices[-bb_period:]
+            state[ta.BB_SUM] = window.sum()
+            state[ta.BB_SUM_SQ] = np.dot(window, window)
+            window = prices[-vol_window:]
+            pct_changes = np.diff(window) / window[:-1] * 100.0
+            state[ta.VOL_SUM] = pct_changes.sum()
+            state[ta.VOL_SUM_SQ] = np.dot(pct_changes, pct_changes)
+    
+    def _tick_memo(self) -> Dict[str, Dict[str, float]]:
+        """Return the indicator results memoized for the latest price, clearing stale ones"""
+        if self._memo_count != self._price_count:
+            self._memo.clear()
+            self._memo_count = self._price_count
+        return self._memo
+    
+    def _price_at(self, offset: int) -> float:
+        """Return the price recorded offset ticks ago, where 1 is the latest"""
+        return self._prices[(self._price_count - offset) % self._cap]
+    
+    def prices_view(self) -> np.ndarray:
+        """Return the buffered prices in chronological order"""
+        if self._price_count <= self._cap:
+            return self._prices[:self._price_count]
+        start = self._price_count % self._cap
+        return np.concatenate((self._prices[start:], self._prices[:start]))
+    
+    @property
+    def price_history(self) -> List[float]:
+        """
+        Recent prices, oldest first, as a new list on each access.
+        prices_view() returns the same prices as an array without the copy.
+        """
+        return self.prices_view().tolist()
+    
+    @property
+    def time_history(self) -> List[datetime]:
+        """
+        Wall-clock times of the recent prices, oldest first, as a new list on each access.
+        The recorded monotonic times are in tick_times_ns.
+        """
+        return [self.wall_time(time_ns) for time_ns in self.tick_times_ns]
+    
+    def _now_ns(self) -> int:
+        """Monotonic nanoseconds since the strategy was created"""
+        return time.monotonic_ns() - self._t0_ns
+    
+    def wall_time(self, time_ns: int) -> datetime:
+        """Convert a time recorded by the strategy (see _now_ns) to a wall-clock datetime"""
+        return self._t0_wall + timedelta(microseconds=time_ns // 1000)
+    
+    def _record_trade(self, time_ns: int, trade_type: int, price: float, quantity: float,
+                      profit: float = np.nan, profit_pct: float = np.nan) -> None:
+        """Append a trade to the trade log, doubling its capacity when it is full"""
+        i = self._n_trades
+        if i == len(self._trade_type):
+            for name in ("_trade_time_ns", "_trade_type", "_trade_price", "_trade_qty",
+                         "_trade_profit", "_trade_profit_pct"):
+                column = getattr(self, name)
+                setattr(self, name, np.concatenate((column, np.empty_like(column))))
+        
+        self._trade_time_ns[i] = time_ns
+        self._trade_type[i] = trade_type
+        self._trade_price[i] = price
+        self._trade_qty[i] = quantity
+        self._trade_profit[i] = profit
+        self._trade_profit_pct[i] = profit_pct
+        self._n_trades = i + 1
+    
+    @property
+    def trade_history(self) -> List[Dict[str, Any]]:
+        """The trade log as one dict per trade, oldest first"""
+        history = []
+        for i in range(self._n_trades):
+            price, quantity = float(self._trade_price[i]), float(self._trade_qty[i])
+            trade = {
+                "time": self.wall_time(int(self._trade_time_ns[i])),
+                "type": TRADE_TYPES[self._trade_type[i]],
+                "price": price,
+                "quantity": quantity,
+                "total": price * quantity
+            }
+            if self._trade_type[i] == TRADE_SELL:
+                profit = float(self._trade_profit[i])
+                known = not np.isnan(profit)
+                trade["profit"] = profit if known else None
+                trade["profit_pct"] = float(self._trade_profit_pct[i]) if known else None
+            history.append(trade)
+        return history
+    
     def calculate_rsi(self) -> float:
         """
         Calculate the Relative Strength Index (RSI) based on price history
         RSI = 100 - (100 / (1 + RS))
         where RS = Average Gain / Average Loss
+        The averages use Wilder's smoothing and are updated as each price is recorded,
+        so this is O(1) per tick.
         """
-        if len(self.price_history) < self.rsi_period + 1:
+        if np.isnan(self._state[ta.AVG_GAIN]):
             return 50  # Default to neutral RSI if we don't have enough data
         
-        # Calculate price changes
-        price_changes = [self.price_history[i] - self.price_history[i-1] 
-                         for i in range(1, len(self.price_history))]
-        
-        # Use the most recent price_changes based on rsi_period
-        price_changes = price_changes[-self.rsi_period:]
-        
-        # Separate gains and losses
-        gains = [change if change > 0 else 0 for change in price_changes]
-        losses = [abs(change) if change < 0 else 0 for change in price_changes]
-        
-        # Calculate average gain and average loss
-        avg_gain = sum(gains) / self.rsi_period if gains else 0
-        avg_loss = sum(losses) / self.rsi_period if losses else 0
-        
-        # Calculate RS and RSI
-        if avg_loss == 0:
-            # Avoid division by zero
-            rsi = 100
-        else:
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
+        rsi = ta._rsi_value(self._state[ta.AVG_GAIN], self._state[ta.AVG_LOSS])
         
         # Store RSI value
         self.rsi_values.append(rsi)
-        if len(self.rsi_values) > self.rsi_period:
-            self.rsi_values.pop(0)
             
         return rsi
     
-    def calculate_ema(self, period: int, prices: List[float]) -> float:
+    def _prices_array(self, prices: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return prices if given, otherwise a chronological view of the price buffer"""
+        if prices is not None:
+            return prices
+        return self.prices_view()
+    
+    def calculate_ema(self, period: int, prices: Union[np.ndarray, Deque[float]]) -> float:
         """
         Calculate the Exponential Moving Average
         EMA = Price(t) * k + EMA(y) * (1 - k)
         where k = 2/(period + 1), t = today, y = yesterday
         """
         if len(prices) < period:
-            return prices[-1] if prices else 0
+            return float(prices[-1]) if len(prices) else 0.0
         
-        # Start with a simple moving average for the first value
-        sma = sum(prices[:period]) / period
+        if not isinstance(prices, np.ndarray):
+            prices = np.fromiter(prices, dtype=np.float64, count=len(prices))
         
-        # Calculate the multiplier
-        multiplier = 2 / (period + 1)
+        k = self._ema_k.get(period) or 2 / (period + 1)
         
-        # Calculate EMA
-        ema = sma
-        for price in prices[period:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-            
-        return ema
+        # The recursion depends on the previous EMA, so it runs in a compiled kernel
+        return float(ta.ema_final(prices, period, k))
     
     def calculate_macd(self) -> Dict[str, float]:
         """
@@ -242,42 +569,28 @@ class XRPTradingStrategy:
         MACD = 12-day EMA - 26-day EMA
         Signal Line = 9-day EMA of MACD
         Histogram = MACD - Signal Line
+        The fast and slow EMAs are advanced by _record_price and the signal EMA by each
+        call here, so no history is re-walked.
         """
-        if len(self.price_history) < self.macd_slow + self.macd_signal:
+        signal_period = self.macd_signal
+        if self._price_count < self.macd_slow + signal_period:
             return {"macd": 0, "signal": 0, "histogram": 0}
         
-        # Calculate the fast and slow EMAs
-        fast_ema = self.calculate_ema(self.macd_fast, self.price_history)
-        slow_ema = self.calculate_ema(self.macd_slow, self.price_history)
+        # The signal EMA must advance only once per price
+        memo = self._tick_memo()
+        if "macd" in memo:
+            return memo["macd"]
         
-        # Calculate MACD
-        macd = fast_ema - slow_ema
+        # Calculate MACD, the signal line (9-day EMA of MACD) and the histogram
+        macd, signal, histogram = ta.macd_step(self._state, signal_period, self._ema_k[signal_period])
         
-        # Update MACD values history
+        # Update MACD, signal and histogram history
         self.macd_values.append(macd)
-        if len(self.macd_values) > self.macd_slow:
-            self.macd_values.pop(0)
-        
-        # Calculate the MACD signal line (9-day EMA of MACD)
-        if len(self.macd_values) < self.macd_signal:
-            signal = macd
-        else:
-            signal = self.calculate_ema(self.macd_signal, self.macd_values)
-        
-        # Update Signal values history
         self.macd_signal_values.append(signal)
-        if len(self.macd_signal_values) > self.macd_signal:
-            self.macd_signal_values.pop(0)
-        
-        # Calculate the MACD histogram
-        histogram = macd - signal
-        
-        # Update Histogram values history
         self.macd_histogram.append(histogram)
-        if len(self.macd_histogram) > self.macd_signal:
-            self.macd_histogram.pop(0)
         
-        return {"macd": macd, "signal": signal, "histogram": histogram}
+        memo["macd"] = {"macd": macd, "signal": signal, "histogram": histogram}
+        return memo["macd"]
     
     def calculate_bollinger_bands(self) -> Dict[str, float]:
         """
@@ -285,91 +598,84 @@ class XRPTradingStrategy:
         Middle Band = 20-day simple moving average (SMA)
         Upper Band = Middle Band + (20-day standard deviation * 2)
         Lower Band = Middle Band - (20-day standard deviation * 2)
+        The mean and variance come from running sums kept by _record_price, so this is O(1).
         """
-        if len(self.price_history) < self.bb_period:
-            middle = self.price_history[-1] if self.price_history else 0
+        period, count = self.bb_period, self._price_count
+        if count < period:
+            middle = float(self._price_at(1)) if count else 0
             return {"upper": middle, "middle": middle, "lower": middle}
         
-        # Get the last n prices
-        prices = self.price_history[-self.bb_period:]
-        
-        # Calculate the middle band (SMA)
-        middle = sum(prices) / len(prices)
-        
-        # Calculate the standard deviation
-        variance = sum((price - middle) ** 2 for price in prices) / len(prices)
-        std_dev = variance ** 0.5
+        memo = self._tick_memo()
+        if "bollinger_bands" in memo:
+            return memo["bollinger_bands"]
         
-        # Calculate the upper and lower bands
-        upper = middle + (std_dev * self.bb_std_dev)
-        lower = middle - (std_dev * self.bb_std_dev)
+        upper, middle, lower = ta.bollinger(self._state, period, float(self.bb_std_dev))
         
         # Update Bollinger Bands history
         self.bb_middle.append(middle)
         self.bb_upper.append(upper)
         self.bb_lower.append(lower)
         
-        # Maintain list length
-        if len(self.bb_middle) > self.bb_period:
-            self.bb_middle.pop(0)
-            self.bb_upper.pop(0)
-            self.bb_lower.pop(0)
-        
-        return {"upper": upper, "middle": middle, "lower": lower}
+        memo["bollinger_bands"] = {"upper": upper, "middle": middle, "lower": lower}
+        return memo["bollinger_bands"]
     
-    def calculate_emas(self) -> Dict[str, float]:
-        """Calculate various EMAs for trend identification"""
-        short_ema = self.calculate_ema(self.ema_short, self.price_history)
-        medium_ema = self.calculate_ema(self.ema_medium, self.price_history)
-        long_ema = self.calculate_ema(self.ema_long, self.price_history)
+    def calculate_emas(self, prices: Optional[np.ndarray] = None) -> Dict[str, float]:
+        """
+        Calculate various EMAs for trend identification.
+        Results for the buffered prices are memoized until the next price arrives.
+        """
+        memo = self._tick_memo() if prices is None else {}
+        if "emas" in memo:
+            return memo["emas"]
+        
+        state = self._state
+        if prices is None and not np.isnan(state[ta.TREND_LONG]):
+            # The streaming EMAs are seeded, so read them instead of walking the history
+            short_ema, medium_ema, long_ema = state[[ta.TREND_SHORT, ta.TREND_MEDIUM, ta.TREND_LONG]].tolist()
+        else:
+            prices = self._prices_array(prices)
+            short_ema = self.calculate_ema(self.ema_short, prices)
+            medium_ema = self.calculate_ema(self.ema_medium, prices)
+            long_ema = self.calculate_ema(self.ema_long, prices)
         
         # Update EMA history
         self.ema_short_values.append(short_ema)
         self.ema_medium_values.append(medium_ema)
         self.ema_long_values.append(long_ema)
         
-        # Maintain list length
-        if len(self.ema_short_values) > self.ema_short:
-            self.ema_short_values.pop(0)
-        if len(self.ema_medium_values) > self.ema_medium:
-            self.ema_medium_values.pop(0)
-        if len(self.ema_long_values) > self.ema_long:
-            self.ema_long_values.pop(0)
-        
-        return {"short": short_ema, "medium": medium_ema, "long": long_ema}
+        memo["emas"] = {"short": short_ema, "medium": medium_ema, "long": long_ema}
+        return memo["emas"]
     
-    def calculate_volatility(self) -> float:
+    def calculate_volatility(self, prices: Optional[np.ndarray] = None) -> float:
         """
         Calculate price volatility as the standard deviation of percentage price changes
         over the volatility window.
         """
-        if len(self.price_history) < self.volatility_window + 1:
+        window = self.volatility_window
+        count = self._price_count if prices is None else len(prices)
+        if count < window + 1:
             return 0  # Return 0 volatility if we don't have enough data
         
-        # Calculate percentage price changes
-        prices = self.price_history[-self.volatility_window:]
-        pct_changes = [(prices[i] - prices[i-1]) / prices[i-1] * 100
-                       for i in range(1, len(prices))]
-        
-        # Calculate standard deviation
-        mean = sum(pct_changes) / len(pct_changes)
-        variance = sum((x - mean) ** 2 for x in pct_changes) / len(pct_changes)
-        volatility = variance ** 0.5  # square root of variance = standard deviation
+        if prices is None:
+            return ta.volatility(self._state, window - 1)
         
-        return volatility
+        # Population standard deviation (ddof=0) of the percentage price changes
+        return float(ta.pct_change_std(prices[-window:]))
         
-    def detect_trend(self) -> str:
+    def detect_trend(self, prices: Optional[np.ndarray] = None) -> str:
         """
         Detect the current market trend using EMA relationships
         Return: "uptrend", "downtrend", or "sideways"
         """
-        if len(self.price_history) < self.ema_long:
+        if self._price_count < self.ema_long:
             return "unknown"  # Not enough data
             
         # Calculate EMAs if not already done
-        emas = self.calculate_emas()
-        
-        # Check EMA alignment for trend detection
+        return self._classify_trend(self.calculate_emas(prices))
+    
+    @staticmethod
+    def _classify_trend(emas: Dict[str, float]) -> str:
+        """Check EMA alignment for trend detection"""
         if emas["short"] > emas["medium"] > emas["long"]:
             return "uptrend"
         elif emas["short"] < emas["medium"] < emas["long"]:
@@ -381,8 +687,11 @@ class XRPTradingStrategy:
         """
         Check if price is near support or resistance levels using Bollinger Bands
         """
-        bb = self.calculate_bollinger_bands()
-        
+        return self._support_resistance(current_price, self.calculate_bollinger_bands())
+    
+    @staticmethod
+    def _support_resistance(current_price: float, bb: Dict[str, float]) -> Dict[str, Any]:
+        """Classify current_price against already calculated Bollinger Bands"""
         # Calculate percentage distance from bands
         upper_distance = ((bb["upper"] - current_price) / current_price) * 100
         lower_distance = ((current_price - bb["lower"]) / current_price) * 100
@@ -400,130 +709,111 @@ class XRPTradingStrategy:
         
         return result
     
-    def analyze_market(self) -> Dict[str, Any]:
+    def _compute_indicators(self) -> List[float]:
+        """
+        Run the fused indicator kernel for the latest tick and record the results in the
+        indicator histories. Returns the values indexed by the result slots in src/_ta_kernels.py.
+        """
+        values = ta.compute_all(
+            self._state, self.bb_period, float(self.bb_std_dev), self.volatility_window,
+            self.macd_signal, self._ema_k[self.macd_signal]
+        ).tolist()
+        
+        self.rsi_values.append(values[ta.RSI])
+        self.macd_values.append(values[ta.MACD])
+        self.macd_signal_values.append(values[ta.MACD_SIGNAL])
+        self.macd_histogram.append(values[ta.MACD_HISTOGRAM])
+        self.bb_upper.append(values[ta.BB_UPPER])
+        self.bb_middle.append(values[ta.BB_MIDDLE])
+        self.bb_lower.append(values[ta.BB_LOWER])
+        self.ema_short_values.append(values[ta.EMA_SHORT])
+        self.ema_medium_values.append(values[ta.EMA_MEDIUM])
+        self.ema_long_values.append(values[ta.EMA_LONG])
+        return values
+    
+    def analyze_market(self) -> MarketSnapshot:
         """
         Analyze the market conditions and generate trading signals using multiple indicators
-        Returns a dictionary with analysis results and trading signals
+        Returns a MarketSnapshot with the indicator values and the trading signal
         """
-        current_price = self.collect_price_data()
-        
-        if current_price == 0 or len(self.price_history) < self.min_data_points:
-            return {
-                "price": current_price,
-                "indicators": {},
-                "signal": "insufficient_data",
-                "reason": "Not enough data points collected",
-                "confidence": 0
-            }
+        self._tick_ns = self._now_ns()
+        current_price = self._fetch_price()
         
-        # Calculate all technical indicators
-        rsi = self.calculate_rsi()
-        macd = self.calculate_macd()
-        bb = self.calculate_bollinger_bands()
-        emas = self.calculate_emas()
-        volatility = self.calculate_volatility()
-        trend = self.detect_trend()
-        sr_levels = self.check_support_resistance(current_price)
-        
-        # Store all indicators for reporting
-        indicators = {
-            "rsi": rsi,
-            "macd": macd,
-            "bollinger_bands": bb,
-            "emas": emas,
-            "volatility": volatility,
-            "trend": trend,
-            "support_resistance": sr_levels
-        }
+        if current_price is None:
+            current_price = 0
+        else:
+            self._record_price(current_price)
+        self._last_analyzed_price = current_price
+        
+        if current_price == 0 or self._price_count < self.min_data_points:
+            return MarketSnapshot(current_price, "insufficient_data", "Not enough data points collected", 0)
+        
+        # Calculate all technical indicators in one kernel call over the streaming state
+        values = self._compute_indicators()
+        rsi = values[ta.RSI]
+        macd = {"macd": values[ta.MACD], "signal": values[ta.MACD_SIGNAL], "histogram": values[ta.MACD_HISTOGRAM]}
+        bb = {"upper": values[ta.BB_UPPER], "middle": values[ta.BB_MIDDLE], "lower": values[ta.BB_LOWER]}
+        emas = {"short": values[ta.EMA_SHORT], "medium": values[ta.EMA_MEDIUM], "long": values[ta.EMA_LONG]}
+        vol = values[ta.VOLATILITY]
+        self._tick_memo().update(macd=macd, bollinger_bands=bb, emas=emas)
+        trend = self._classify_trend(emas)
+        sr_levels = self._support_resistance(current_price, bb)
+        indicators = (
+            rsi, values[ta.MACD], values[ta.MACD_SIGNAL], values[ta.MACD_HISTOGRAM],
+            values[ta.BB_UPPER], values[ta.BB_MIDDLE], values[ta.BB_LOWER],
+            values[ta.EMA_SHORT], values[ta.EMA_MEDIUM], values[ta.EMA_LONG],
+            vol, trend, sr_levels
+        )
+        
+        # A price within min_tick (relative) of the last scored analysis would produce the same
+        # signal, so reuse it with this tick's indicators, unless the position has changed
+        last = self._last_analysis
+        if (last is not None and abs(current_price - last.price) < self.min_tick * last.price
+                and self._last_analysis_position == (self.position_size, self.last_buy_price)):
+            return MarketSnapshot(current_price, last.signal, last.reason, last.confidence,
+                                  last.buy_signals, last.sell_signals, *indicators)
         
         # Initialize signal components
         signal = "hold"  # Default to hold
         reasons = []
         confidence = 0.0
         
-        # === BUY SIGNAL ANALYSIS ===
-        buy_signals = 0
-        buy_confidence = 0.0
-        
-        # RSI buy signals (oversold condition)
-        if rsi < self.oversold_threshold:
-            buy_signals += 1
-            buy_confidence += 0.2
-            reasons.append(f"RSI ({rsi:.2f}) indicates oversold condition")
-        elif rsi < 40:  # Approaching oversold
-            buy_signals += 0.5
-            buy_confidence += 0.1
-        
-        # MACD buy signals (bullish crossover or histogram turning positive)
+        # MACD histogram crossovers and momentum need the last two histogram values
         if len(self.macd_histogram) > 2:
-            # Histogram turning positive is bullish
-            if self.macd_histogram[-2] < 0 and self.macd_histogram[-1] > 0:
-                buy_signals += 1
-                buy_confidence += 0.2
-                reasons.append("MACD bullish crossover detected")
-            # Histogram becoming less negative is bullish momentum
-            elif self.macd_histogram[-2] < self.macd_histogram[-1] < 0:
-                buy_signals += 0.5
-                buy_confidence += 0.1
-        
-        # Bollinger Bands buy signals (price at or below lower band)
-        if current_price <= bb["lower"] * 1.01:  # Within 1% of lower band
-            buy_signals += 1
-            buy_confidence += 0.15
-            reasons.append("Price at lower Bollinger Band (support level)")
-        
-        # Trend-based buy signals
-        if trend == "uptrend":
-            buy_signals += 0.5
-            buy_confidence += 0.1
-            # Add to reasons only if it's a strong signal overall
-            if buy_signals > 1.5:  
-                reasons.append("Confirmed uptrend provides favorable buying conditions")
+            prev_hist, last_hist = self.macd_histogram[-2], self.macd_histogram[-1]
+        else:
+            prev_hist = last_hist = 0.0
+        
+        # === BUY SIGNAL ANALYSIS ===
+        buy_rsi = rsi < self.oversold_threshold
+        buy_cross = prev_hist < 0 < last_hist  # Histogram turning positive is bullish
+        buy_conditions = np.array([
+            buy_rsi,
+            not buy_rsi and rsi < 40,  # Approaching oversold
+            buy_cross,
+            not buy_cross and prev_hist < last_hist < 0,  # Histogram becoming less negative
+            current_price <= bb["lower"] * 1.01,  # Within 1% of lower band
+            trend == "uptrend",
+        ], dtype=bool)
+        buy_signals = float(buy_conditions @ BUY_WEIGHTS)
+        buy_confidence = float(buy_conditions @ BUY_CONFIDENCE)
+        reasons.extend(_fired_reasons(buy_conditions, BUY_WEIGHTS, BUY_REASONS, rsi=rsi))
         
         # === SELL SIGNAL ANALYSIS ===
-        sell_signals = 0
-        sell_confidence = 0.0
-        
-        # RSI sell signals (overbought condition)
-        if rsi > self.overbought_threshold:
-            sell_signals += 1
-            sell_confidence += 0.2
-            reasons.append(f"RSI ({rsi:.2f}) indicates overbought condition")
-        elif rsi > 60:  # Approaching overbought
-            sell_signals += 0.5
-            sell_confidence += 0.1
-        
-        # MACD sell signals (bearish crossover or histogram turning negative)
-        if len(self.macd_histogram) > 2:
-            # Histogram turning negative is bearish
-            if self.macd_histogram[-2] > 0 and self.macd_histogram[-1] < 0:
-                sell_signals += 1
-                sell_confidence += 0.2
-                reasons.append("MACD bearish crossover detected")
-            # Histogram becoming less positive is bearish momentum
-            elif self.macd_histogram[-2] > self.macd_histogram[-1] > 0:
-                sell_signals += 0.5
-                sell_confidence += 0.1
-        
-        # Bollinger Bands sell signals (price at or above upper band)
-        if current_price >= bb["upper"] * 0.99:  # Within 1% of upper band
-            sell_signals += 1
-            sell_confidence += 0.15
-            reasons.append("Price at upper Bollinger Band (resistance level)")
-        
-        # Trend-based sell signals
-        if trend == "downtrend":
-            sell_signals += 0.5
-            sell_confidence += 0.1
-            # Add to reasons only if it's a strong signal overall
-            if sell_signals > 1.5:
-                reasons.append("Confirmed downtrend suggests selling")
-        
-        # High volatility might be a reason to sell to reduce risk
-        if volatility > 3.0:  # Very high volatility
-            sell_signals += 0.5
-            sell_confidence += 0.1
-            reasons.append(f"Extremely high volatility ({volatility:.2f}%)")
+        sell_rsi = rsi > self.overbought_threshold
+        sell_cross = prev_hist > 0 > last_hist  # Histogram turning negative is bearish
+        sell_conditions = np.array([
+            sell_rsi,
+            not sell_rsi and rsi > 60,  # Approaching overbought
+            sell_cross,
+            not sell_cross and prev_hist > last_hist > 0,  # Histogram becoming less positive
+            current_price >= bb["upper"] * 0.99,  # Within 1% of upper band
+            trend == "downtrend",
+            vol > 3.0,  # High volatility might be a reason to sell to reduce risk
+        ], dtype=bool)
+        sell_signals = float(sell_conditions @ SELL_WEIGHTS)
+        sell_confidence = float(sell_conditions @ SELL_CONFIDENCE)
+        reasons.extend(_fired_reasons(sell_conditions, SELL_WEIGHTS, SELL_REASONS, rsi=rsi, volatility=vol))
         
         # === DETERMINE FINAL SIGNAL ===
         
@@ -576,51 +866,94 @@ class XRPTradingStrategy:
         # Format reason string
         reason = " | ".join(reasons) if reasons else "Market analysis inconclusive"
         
-        return {
-            "price": current_price,
-            "indicators": indicators,
-            "signal": signal,
-            "reason": reason,
-            "confidence": confidence,
-            "buy_signals": buy_signals,
-            "sell_signals": sell_signals
-        }
+        analysis = MarketSnapshot(current_price, signal, reason, confidence, buy_signals, sell_signals, *indicators)
+        self._last_analysis = analysis
+        self._last_analysis_position = (self.position_size, self.last_buy_price)
+        return analysis
+    
+    def _hold(self, simulate: bool, out: List[str]) -> None:
+        """Action taken when no signal is strong enough to trade; messages are appended to out"""
+        out.append("Holding position - signal not strong enough")
+    
+    def _buy(self, simulate: bool, out: List[str]) -> None:
+        """Action taken on a confident buy signal; messages are appended to out"""
+        if simulate:
+            out.append("[SIMULATION] Would place buy order now")
+            return
+        try:
+            order_result = self.place_buy_order(timestamp=self._tick_ns)
+            if order_result.get('status') == 'failed':
+                out.append(f"Buy order failed: {order_result.get('reason')}")
+            else:
+                out.append(f"Buy order placed: {order_result}")
+        except Exception as e:
+            out.append(f"Error placing buy order: {e}")
+    
+    def _sell(self, simulate: bool, out: List[str]) -> None:
+        """Action taken on a confident sell signal; messages are appended to out"""
+        if simulate:
+            out.append("[SIMULATION] Would place sell order now")
+            return
+        try:
+            order_result = self.place_sell_order(timestamp=self._tick_ns)
+            if order_result.get('status') == 'failed':
+                out.append(f"Sell order failed: {order_result.get('reason')}")
+            else:
+                out.append(f"Sell order placed: {order_result}")
+        except Exception as e:
+            out.append(f"Error placing sell order: {e}")
     
-    def place_buy_order(self) -> Dict:
-        """Place a buy order for XRP"""
-        print(f"Placing buy order for {self.quantity} of {self.symbol}")
+    def _order_price(self) -> float:
+        """Price to record for an order: the analyzed price, or a fresh quote if there is none"""
+        if self._last_analyzed_price:
+            return self._last_analyzed_price
+        self._tick_ns = self._now_ns()
+        return self.collect_price_data()
+    
+    def place_buy_order(self, timestamp: Optional[int] = None) -> Dict:
+        """
+        Place a buy order for XRP
+        
+        Args:
+            timestamp: Time to record for the trade as returned by _now_ns, normally the
+                analyzed tick's time; defaults to the current time
+        """
+        logger.info("Placing buy order for %s of %s", self.quantity, self.symbol)
         
-        # First check account balance to ensure we have enough funds
-        account = self.client.get_account()
+        # First check account balance to ensure we have enough funds, bypassing the response cache
+        account = self.client.get_account(cached=False)
         
         # Determine available buying power
-        buying_power = 0
-        if account and 'buying_power' in account:
-            buying_power = float(account['buying_power'])
-            print(f"Available buying power: ${buying_power}")
-        elif account and account.get('results'):
-            # Try alternate format
-            buying_power = float(account['results'][0].get('buying_power', 0))
-            print(f"Available buying power: ${buying_power}")
+        buying_power = 0.0
+        if account:
+            raw = account.get('buying_power')
+            if raw is None and account.get('results'):
+                # Try alternate format
+                raw = account['results'][0].get('buying_power')
+            if raw is not None:
+                buying_power = float(raw)
+                logger.debug("Available buying power: $%s", buying_power)
         
         # Check if we have enough funds
-        current_price = self.collect_price_data()
-        order_cost = float(self.quantity) * current_price
+        current_price = self._order_price()
+        order_quantity = float(self.quantity)
+        order_cost = order_quantity * current_price
         
         if order_cost > buying_power:
-            print(f"Warning: Insufficient funds for order (Need ${order_cost:.2f}, have ${buying_power:.2f})")
+            logger.warning("Insufficient funds for order (Need $%.2f, have $%.2f)", order_cost, buying_power)
             # Adjust quantity if needed
-            adjusted_quantity = str(int(float(self.quantity) * (buying_power / order_cost) * 0.95))  # 5% buffer
-            if float(adjusted_quantity) < 1:
-                print("Cannot place order: Insufficient funds even for minimum quantity")
+            adjusted = int(order_quantity * (buying_power / order_cost) * 0.95)  # 5% buffer
+            if adjusted < 1:
+                logger.warning("Cannot place order: Insufficient funds even for minimum quantity")
                 return {"status": "failed", "reason": "insufficient_funds"}
             
-            print(f"Adjusting quantity from {self.quantity} to {adjusted_quantity}")
-            self.quantity = adjusted_quantity
+            logger.warning("Adjusting quantity from %s to %s", self.quantity, adjusted)
+            self.quantity = str(adjusted)
+            order_quantity = float(adjusted)
         
         try:
             order = self.client.place_order(
-                str(uuid.uuid4()),
+                self.client.next_client_order_id(),
                 "buy",
                 "market",
                 self.symbol,
@@ -628,103 +961,98 @@ class XRPTradingStrategy:
             )
             
             # Update position tracking
-            order_quantity = float(self.quantity)
             self.position_size += order_quantity
             self.last_buy_price = current_price
             
             # Record the trade in history
-            trade_record = {
-                "time": datetime.now(),
-                "type": "buy",
-                "price": current_price,
-                "quantity": order_quantity,
-                "total": current_price * order_quantity
-            }
-            self.trade_history.append(trade_record)
+            trade_ns = self._now_ns() if timestamp is None else timestamp
+            self._record_trade(trade_ns, TRADE_BUY, current_price, order_quantity)
             
-            print(f"Buy order placed: {order}")
+            logger.info("Buy order placed: %s", order)
             return order
             
         except Exception as e:
-            print(f"Error placing buy order: {e}")
+            logger.error("Error placing buy order: %s", e)
             return {"status": "failed", "reason": str(e)}
     
-    def place_sell_order(self) -> Dict:
-        """Place a sell order for XRP"""
-        print(f"Placing sell order for {self.quantity} of {self.symbol}")
+    def place_sell_order(self, timestamp: Optional[int] = None) -> Dict:
+        """
+        Place a sell order for XRP
         
-        # First check holdings to ensure we have enough XRP
-        holdings = self.client.get_holdings("XRP")
+        Args:
+            timestamp: Time to record for the trade as returned by _now_ns, normally the
+                analyzed tick's time; defaults to the current time
+        """
+        logger.info("Placing sell order for %s of %s", self.quantity, self.symbol)
+        
+        # First check holdings to ensure we have enough XRP, bypassing the response cache
+        holdings = self.client.get_holdings("XRP", cached=False)
         
         # Determine available holdings
         available_xrp = 0
         if holdings and 'holdings' in holdings and holdings['holdings']:
             available_xrp = float(holdings['holdings'][0].get('quantity', 0))
-            print(f"Available XRP: {available_xrp}")
+            logger.debug("Available XRP: %s", available_xrp)
         elif holdings and 'results' in holdings:
             # Try alternate format - look for XRP in results
             xrp_holdings = [h for h in holdings['results'] if h.get('asset_code') == 'XRP']
             if xrp_holdings:
-                # Try different field names
-                available_xrp = float(xrp_holdings[0].get('total_quantity', 
-                               xrp_holdings[0].get('quantity', 
-                               xrp_holdings[0].get('quantity_available_for_trading', 0))))
-                print(f"Available XRP: {available_xrp}")
+                # Use the first quantity field this response format provides
+                holding = xrp_holdings[0]
+                raw = next((holding[k] for k in HOLDING_QUANTITY_FIELDS if holding.get(k) is not None), 0)
+                available_xrp = float(raw)
+                logger.debug("Available XRP: %s", available_xrp)
         
         # Check if we have enough XRP
-        if float(self.quantity) > available_xrp:
-            print(f"Warning: Insufficient XRP for order (Need {self.quantity}, have {available_xrp})")
+        order_quantity = float(self.quantity)
+        if order_quantity > available_xrp:
+            logger.warning("Insufficient XRP for order (Need %s, have %s)", self.quantity, available_xrp)
             # Adjust quantity if needed
             if available_xrp <= 0:
-                print("Cannot place order: No XRP holdings")
+                logger.warning("Cannot place order: No XRP holdings")
                 return {"status": "failed", "reason": "no_holdings"}
             
-            adjusted_quantity = str(int(available_xrp * 0.99))  # 1% buffer for safety
-            print(f"Adjusting quantity from {self.quantity} to {adjusted_quantity}")
-            self.quantity = adjusted_quantity
+            adjusted = int(available_xrp * 0.99)  # 1% buffer for safety
+            logger.warning("Adjusting quantity from %s to %s", self.quantity, adjusted)
+            self.quantity = str(adjusted)
+            order_quantity = float(adjusted)
         
         try:
             order = self.client.place_order(
-                str(uuid.uuid4()),
+                self.client.next_client_order_id(),
                 "sell",
                 "market",
                 self.symbol,
                 {"asset_quantity": self.quantity}
             )
             
-            # Update position tracking
-            current_price = self.collect_price_data()
-            order_quantity = float(self.quantity)
+            # Update position tracking with the price the sell decision was based on
+            current_price = self._order_price()
             
             # Calculate profit/loss if we have a last buy price
             if self.last_buy_price > 0:
                 profit = (current_price - self.last_buy_price) * order_quantity
                 profit_pct = ((current_price - self.last_buy_price) / self.last_buy_price) * 100
                 self.profit_loss += profit
-                print(f"Trade P&L: ${profit:.2f} ({profit_pct:.2f}%)")
-                print(f"Total P&L: ${self.profit_loss:.2f}")
+                logger.info("Trade P&L: $%.2f (%.2f%%)", profit, profit_pct)
+                logger.info("Total P&L: $%.2f", self.profit_loss)
             
             # Update position size
             self.position_size = max(0, self.position_size - order_quantity)
             self.last_sell_price = current_price
             
             # Record the trade in history
-            trade_record = {
-                "time": datetime.now(),
-                "type": "sell",
-                "price": current_price,
-                "quantity": order_quantity,
-                "total": current_price * order_quantity,
-                "profit": profit if self.last_buy_price > 0 else None,
-                "profit_pct": profit_pct if self.last_buy_price > 0 else None
-            }
-            self.trade_history.append(trade_record)
+            trade_ns = self._now_ns() if timestamp is None else timestamp
+            if self.last_buy_price > 0:
+                self._record_trade(trade_ns, TRADE_SELL, current_price, order_quantity, profit, profit_pct)
+            else:
+                self._record_trade(trade_ns, TRADE_SELL, current_price, order_quantity)
             
-            print(f"Sell order placed: {order}")
+            logger.info("Sell order placed: %s", order)
             return order
             
         except Exception as e:
-            print(f"Error placing sell order: {e}")
+            logger.error("Error placing sell order: %s", e)
             return {"status": "failed", "reason": str(e)}
     
     def execute(self, simulate: bool = True) -> None:
@@ -734,105 +1062,82 @@ class XRPTradingStrategy:
         Args:
             simulate: If True, only simulate orders without actually placing them
         """
-        print(f"\n--- {time.strftime('%Y-%m-%d %H:%M:%S')} ---")
+        # The cycle's output is collected here and written with a single call at the end,
+        # so it costs one write and is not interleaved with other threads' output
+        out = [f"\n--- {time.strftime('%Y-%m-%d %H:%M:%S')} ---"]
+        emit = out.append
         
         try:
             # Attempt to perform market analysis with all indicators
             analysis = self.analyze_market()
+            price, signal, confidence = analysis.price, analysis.signal, analysis.confidence
             
             # Display current price
-            if analysis['price'] > 0:
-                print(f"Current XRP price: ${analysis['price']:.4f}")
+            if price > 0:
+                emit(f"Current XRP price: ${price:.4f}")
             else:
-                print("Warning: Unable to get reliable price data")
+                emit("Warning: Unable to get reliable price data")
                 return  # Skip this execution cycle if we don't have price data
             
+            # Unrealized P&L of the open position, shared by the display and the simulated exits
+            last_buy_price, position_size = self.last_buy_price, self.position_size
+            if last_buy_price > 0:
+                price_change = price - last_buy_price
+                unrealized_pl = price_change * position_size
+                unrealized_pl_pct = price_change / last_buy_price * 100
+            else:
+                unrealized_pl = unrealized_pl_pct = 0.0
+            
             # Display summary of position and P&L if we have a position
-            if self.position_size > 0:
-                unrealized_pl = (analysis['price'] - self.last_buy_price) * self.position_size
-                unrealized_pl_pct = ((analysis['price'] - self.last_buy_price) / self.last_buy_price) * 100
-                print(f"Current position: {self.position_size} XRP @ ${self.last_buy_price:.4f}")
-                print(f"Unrealized P&L: ${unrealized_pl:.2f} ({unrealized_pl_pct:.2f}%)")
+            if position_size > 0:
+                emit(f"Current position: {self.position_size} XRP @ ${self.last_buy_price:.4f}")
+                emit(f"Unrealized P&L: ${unrealized_pl:.2f} ({unrealized_pl_pct:.2f}%)")
             
             # Display analysis and generate signals if we have enough data
-            if 'indicators' in analysis and analysis['indicators']:
-                indicators = analysis['indicators']
-                
+            if analysis.has_indicators:
                 # Display key indicators
-                if 'rsi' in indicators:
-                    print(f"RSI: {indicators['rsi']:.2f}")
-                
-                if 'macd' in indicators:
-                    print(f"MACD: {indicators['macd']['macd']:.4f}, Signal: {indicators['macd']['signal']:.4f}, Histogram: {indicators['macd']['histogram']:.4f}")
-                
-                if 'bollinger_bands' in indicators:
-                    bb = indicators['bollinger_bands']
-                    print(f"Bollinger Bands: Upper: ${bb['upper']:.4f}, Middle: ${bb['middle']:.4f}, Lower: ${bb['lower']:.4f}")
-                
-                if 'trend' in indicators:
-                    print(f"Trend: {indicators['trend']}")
-                
-                if 'volatility' in indicators:
-                    print(f"Volatility: {indicators['volatility']:.2f}%")
+                emit(f"RSI: {analysis.rsi:.2f}")
+                emit(f"MACD: {analysis.macd:.4f}, Signal: {analysis.macd_signal:.4f}, Histogram: {analysis.macd_hist:.4f}")
+                emit(f"Bollinger Bands: Upper: ${analysis.bb_upper:.4f}, Middle: ${analysis.bb_mid:.4f}, Lower: ${analysis.bb_lower:.4f}")
+                emit(f"Trend: {analysis.trend}")
+                emit(f"Volatility: {analysis.volatility:.2f}%")
                 
                 # Display trading signal with confidence
-                print(f"Signal: {analysis['signal']} (Confidence: {analysis['confidence']:.2f})")
-                print(f"Buy signals: {analysis.get('buy_signals', 0)}, Sell signals: {analysis.get('sell_signals', 0)}")
-                print(f"Reason: {analysis['reason']}")
-                
-                # Execute orders based on the signal and confidence
-                if analysis['signal'] == 'buy' and analysis['confidence'] >= 0.6:  # Require higher confidence for buys
-                    if simulate:
-                        print("[SIMULATION] Would place buy order now")
-                    else:
-                        try:
-                            order_result = self.place_buy_order()
-                            if order_result.get('status') == 'failed':
-                                print(f"Buy order failed: {order_result.get('reason')}")
-                        except Exception as e:
-                            print(f"Error placing buy order: {e}")
-                
-                elif analysis['signal'] == 'sell' and analysis['confidence'] >= 0.5:  # Lower threshold for sells (risk management)
-                    if simulate:
-                        print("[SIMULATION] Would place sell order now")
-                    else:
-                        try:
-                            order_result = self.place_sell_order()
-                            if order_result.get('status') == 'failed':
-                                print(f"Sell order failed: {order_result.get('reason')}")
-                        except Exception as e:
-                            print(f"Error placing sell order: {e}")
+                emit(f"Signal: {signal} (Confidence: {confidence:.2f})")
+                emit(f"Buy signals: {analysis.buy_signals}, Sell signals: {analysis.sell_signals}")
+                emit(f"Reason: {analysis.reason}")
                 
-                else:
-                    print("Holding position - signal not strong enough")
+                # Execute orders based on the signal and confidence:
+                # 0 = hold, 1 = buy, 2 = sell (the signal is at most one of buy and sell)
+                action = (((signal == 'buy') & (confidence >= BUY_CONFIDENCE_MIN))
+                          + 2 * ((signal == 'sell') & (confidence >= SELL_CONFIDENCE_MIN)))
+                self._actions[action](simulate, out)
                     
                 # Additional features for simulation mode
-                if simulate and self.position_size > 0:
+                if simulate and position_size > 0:
                     # Update simulated P&L for tracking performance
-                    current_price = analysis['price']
-                    if self.last_buy_price > 0:
-                        unrealized_pl = (current_price - self.last_buy_price) * self.position_size
-                        unrealized_pl_pct = ((current_price - self.last_buy_price) / self.last_buy_price) * 100
-                        
+                    if last_buy_price > 0:
                         # Check for simulated stop loss or profit taking
                         if unrealized_pl_pct <= -self.stop_loss * 100:
-                            print(f"[SIMULATION] Stop loss triggered at ${current_price:.4f} (-{abs(unrealized_pl_pct):.2f}%)")
-                            print(f"[SIMULATION] Would sell {self.position_size} XRP for ${unrealized_pl:.2f} loss")
+                            emit(f"[SIMULATION] Stop loss triggered at ${price:.4f} (-{abs(unrealized_pl_pct):.2f}%)")
+                            emit(f"[SIMULATION] Would sell {position_size} XRP for ${unrealized_pl:.2f} loss")
                             self.profit_loss += unrealized_pl
                             self.position_size = 0
                         elif unrealized_pl_pct >= self.profit_target * 100:
-                            print(f"[SIMULATION] Profit target reached at ${current_price:.4f} (+{unrealized_pl_pct:.2f}%)")
-                            print(f"[SIMULATION] Would sell {self.position_size} XRP for ${unrealized_pl:.2f} profit")
+                            emit(f"[SIMULATION] Profit target reached at ${price:.4f} (+{unrealized_pl_pct:.2f}%)")
+                            emit(f"[SIMULATION] Would sell {position_size} XRP for ${unrealized_pl:.2f} profit")
                             self.profit_loss += unrealized_pl
                             self.position_size = 0
             else:
-                print("Collecting initial data, no signals generated yet")
+                emit("Collecting initial data, no signals generated yet")
                 
         except Exception as e:
-            print(f"Error during strategy execution: {e}")
-            import traceback
-            traceback.print_exc()
-            print("Continuing to next cycle...")
+            emit(f"Error during strategy execution: {e}")
+            # Keep the traceback with the rest of this cycle's output
+            emit(traceback.format_exc().rstrip("\n"))
+            emit("Continuing to next cycle...")
+        finally:
+            sys.stdout.write("\n".join(out) + "\n")
 
 
 def run_xrp_strategy(quantity: str = "10", interval: int = 60, duration: int = 3600, simulate: bool = True):
@@ -850,15 +1155,22 @@ def run_xrp_strategy(quantity: str = "10", interval: int = 60, duration: int = 3
     # First, check API connectivity
     print("\nVerifying API connectivity and available trading pairs...")
     
+    # The start-up checks are independent, so request them all at once
+    startup = client.fetch_concurrently({
+        "account": (client.get_account, ()),
+        "pairs": (client.get_trading_pairs, ()),
+        "price": (client.get_best_bid_ask, ("XRP-USD",)),
+    })
+    
     # Check if we can get account information (basic authentication test)
-    account_info = client.get_account()
+    account_info = startup["account"]
     if not account_info:
         print("⚠️ Failed to get account information. API authentication may be incorrect.")
         print("Please check that your API_KEY and BASE64_PRIVATE_KEY are set correctly in the .env file.")
         return
     
     # Check if XRP-USD is available
-    pairs = client.get_trading_pairs()
+    pairs = startup["pairs"]
     
     if not pairs:
         print("⚠️ Failed to retrieve trading pairs.")
@@ -878,16 +1190,16 @@ def run_xrp_strategy(quantity: str = "10", interval: int = 60, duration: int = 3
             print("Continuing with XRP strategy, but watch for errors...")
             xrp_verified = False
         else:
-            # Find XRP in the pairs list - check both formats for symbol field
-            xrp_pairs = [pair for pair in pairs_list if pair.get('symbol') == 'XRP-USD']
+            # Find XRP in the pairs list, stopping at the first match
+            xrp_pair = next((pair for pair in pairs_list if pair.get('symbol') == 'XRP-USD'), None)
             
-            if not xrp_pairs:
+            if xrp_pair is None:
                 print("⚠️ Warning: XRP-USD trading pair not found in the available pairs.")
                 print("Available pairs may include:", [p.get('symbol') for p in pairs_list[:5]], "...")
                 print("Continuing anyway, but API calls may fail...")
                 xrp_verified = False
             else:
-                print(f"✅ XRP-USD trading pair is available: {xrp_pairs[0]}")
+                print(f"✅ XRP-USD trading pair is available: {xrp_pair}")
                 xrp_verified = True
     
     # Create the strategy instance
@@ -895,17 +1207,10 @@ def run_xrp_strategy(quantity: str = "10", interval: int = 60, duration: int = 3
     
     # Get initial XRP price for performance comparison
     initial_price = 0
-    try:
-        price_response = client.get_best_bid_ask("XRP-USD")
-        if price_response and 'best_bid_ask' in price_response and price_response['best_bid_ask']:
-            best_bid_ask = price_response['best_bid_ask'][0]
-            if 'bid_price' in best_bid_ask and 'ask_price' in best_bid_ask:
-                bid = float(best_bid_ask['bid_price'])
-                ask = float(best_bid_ask['ask_price'])
-                initial_price = (bid + ask) / 2
-                print(f"Initial XRP price: ${initial_price:.4f}")
-    except Exception as e:
-        print(f"Error getting initial price: {e}")
+    bid_ask = parse_best_bid_ask(startup["price"])
+    if bid_ask:
+        initial_price = (bid_ask[0] + bid_ask[1]) / 2
+        print(f"Initial XRP price: ${initial_price:.4f}")
     
     print(f"\nStarting XRP trading strategy with quantity {quantity}")
     print(f"Checking at {interval} second intervals")
@@ -925,32 +1230,44 @@ def run_xrp_strategy(quantity: str = "10", interval: int = 60, duration: int = 3
     
     print("Press Ctrl+C to stop")
     
-    # Record start time for calculating performance
-    start_time = time.time()
+    # Record start time for calculating performance; the monotonic clock is unaffected by
+    # wall-clock adjustments
+    start_time = time.monotonic()
     execution_count = 0
     
+    # Bound to locals once so the loop does not look them up on the time module every tick
+    monotonic, sleep, execute = time.monotonic, time.sleep, strategy.execute
+    
     try:
-        while time.time() - start_time < duration:
-            strategy.execute(simulate)
+        # Schedule executions against fixed deadlines so the time spent in execute()
+        # does not push every later tick back
+        next_tick = start_time + interval
+        while monotonic() - start_time < duration:
+            execute(simulate)
             execution_count += 1
-            time.sleep(interval)
+            
+            now = monotonic()
+            if next_tick <= now and interval > 0:
+                # Execution overran its slot; move on to the next deadline still ahead
+                missed = int((now - next_tick) // interval) + 1
+                next_tick += missed * interval
+                logger.warning("Strategy execution overran the %ss interval, skipping %d tick(s)", interval, missed)
+            if next_tick > now:
+                sleep(next_tick - now)
+            next_tick += interval
     except KeyboardInterrupt:
         print("\nStrategy execution stopped by user")
     
     # Calculate final performance
-    runtime = time.time() - start_time
+    runtime = time.monotonic() - start_time
     runtime_minutes = runtime / 60
     
     # Get final XRP price
     final_price = 0
     try:
-        price_response = client.get_best_bid_ask("XRP-USD")
-        if price_response and 'best_bid_ask' in price_response and price_response['best_bid_ask']:
-            best_bid_ask = price_response['best_bid_ask'][0]
-            if 'bid_price' in best_bid_ask and 'ask_price' in best_bid_ask:
-                bid = float(best_bid_ask['bid_price'])
-                ask = float(best_bid_ask['ask_price'])
-                final_price = (bid + ask) / 2
+        bid_ask = parse_best_bid_ask(client.get_best_bid_ask("XRP-USD"))
+        if bid_ask:
+            final_price = (bid_ask[0] + bid_ask[1]) / 2
     except Exception as e:
         print(f"Error getting final price: {e}")
     
@@ -976,31 +1293,29 @@ def run_xrp_strategy(quantity: str = "10", interval: int = 60, duration: int = 3
             print(f"Annualized return: {annualized_return:.2f}%")
     
     # Print trade history summary
-    if strategy.trade_history:
+    n_trades = strategy._n_trades
+    if n_trades:
         print("\nTrade History:")
-        print(f"Total trades: {len(strategy.trade_history)}")
+        print(f"Total trades: {n_trades}")
         
-        buy_trades = [t for t in strategy.trade_history if t['type'] == 'buy']
-        sell_trades = [t for t in strategy.trade_history if t['type'] == 'sell']
+        # Count trades and total the wins and losses in a single pass over the trade log
+        sell_count, wins, losses, win_total, loss_total = ta.trade_summary(
+            strategy._trade_type[:n_trades], strategy._trade_profit[:n_trades], TRADE_SELL
+        )
         
-        print(f"Buy trades: {len(buy_trades)}")
-        print(f"Sell trades: {len(sell_trades)}")
+        print(f"Buy trades: {n_trades - sell_count}")
+        print(f"Sell trades: {sell_count}")
         
         # Calculate win rate if we have profits/losses
-        profitable_trades = [t for t in strategy.trade_history if t.get('profit', 0) and t.get('profit') > 0]
-        losing_trades = [t for t in strategy.trade_history if t.get('profit', 0) and t.get('profit') < 0]
-        
-        if profitable_trades or losing_trades:
-            win_rate = len(profitable_trades) / (len(profitable_trades) + len(losing_trades)) * 100 if (len(profitable_trades) + len(losing_trades)) > 0 else 0
+        if wins or losses:
+            win_rate = wins / (wins + losses) * 100
             print(f"Win rate: {win_rate:.2f}%")
             
-            if profitable_trades:
-                avg_profit = sum(t['profit'] for t in profitable_trades) / len(profitable_trades)
-                print(f"Average profit per winning trade: ${avg_profit:.2f}")
+            if wins:
+                print(f"Average profit per winning trade: ${win_total / wins:.2f}")
             
-            if losing_trades:
-                avg_loss = sum(t['profit'] for t in losing_trades) / len(losing_trades)
-                print(f"Average loss per losing trade: ${avg_loss:.2f}")
+            if losses:
+                print(f"Average loss per losing trade: ${loss_total / losses:.2f}")
     
     # If we have current position, show unrealized P&L
     if strategy.position_size > 0 and final_price > 0 and strategy.last_buy_price > 0:
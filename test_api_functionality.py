@@ -1,22 +1,32 @@
 import time
 import uuid
-import requests
-from src.crypto_api_trading import CryptoAPITrading
+from typing import Any, Dict
+import urllib3
+from src.crypto_api_trading import CryptoAPITrading, parse_best_bid_ask
 
-def check_api_connectivity():
+def as_dict(response: Any) -> Dict[str, Any]:
+    """Return a response if it supports dict lookups, otherwise an empty dict"""
+    return response if hasattr(response, "get") else {}
+
+def describe_keys(response: Any) -> Any:
+    """Return a response's keys for display, or a note when it is not a dictionary"""
+    return response.keys() if hasattr(response, "keys") else 'Not a dictionary'
+
+def check_api_connectivity(client: CryptoAPITrading):
     """
     Check if we can connect to the Robinhood API server
     This helps determine if the issue is authentication, network, or endpoint related
+    
+    The probe goes through the client's connection pool, so the connection it opens is
+    kept alive and reused by the API calls that follow.
     """
     print("\n===== CHECKING API CONNECTIVITY =====\n")
     
-    base_url = "https://trading.robinhood.com"
-    
     try:
-        response = requests.get(f"{base_url}/", timeout=10)
-        print(f"Base API connectivity: Status code {response.status_code}")
-        return response.status_code < 400
-    except requests.RequestException as e:
+        response = client.pool.request("GET", "/", retries=False)
+        print(f"Base API connectivity: Status code {response.status}")
+        return response.status < 400
+    except urllib3.exceptions.HTTPError as e:
         print(f"Failed to connect to API server: {e}")
         print("Please check your internet connection or if the API domain is correct")
         return False
@@ -26,17 +36,33 @@ def test_api_functionality():
     Test all the Robinhood API functionality to ensure it's working properly
     before implementing XRP-specific trading.
     """
+    client = CryptoAPITrading()
+    
     # First check basic connectivity
-    connectivity = check_api_connectivity()
+    connectivity = check_api_connectivity(client)
     if not connectivity:
         print("⚠️ Warning: Could not connect to the API server. Tests may fail.")
     
-    client = CryptoAPITrading()
     print("\n===== TESTING API AUTHENTICATION & ENDPOINTS =====\n")
     
+    # The test requests are independent, so issue them all at once and report on the
+    # responses in order below
+    potential_xrp_pairs = ["XRP-USD", "XRP/USD", "XRP-USDT", "XRP-USDC"]
+    calls = {
+        "account": (client.get_account, ()),
+        "pairs": (client.get_trading_pairs, ()),
+        "holdings": (client.get_holdings, ()),
+        "btc_bid_ask": (client.get_best_bid_ask, ("BTC-USD",)),
+        "btc_est_price": (client.get_estimated_price, ("BTC-USD", "both", "0.0001")),
+        "orders": (client.get_orders, ()),
+    }
+    for pair in potential_xrp_pairs:
+        calls[pair] = (client.get_best_bid_ask, (pair,))
+    responses = client.fetch_concurrently(calls)
+    
     # Test 1: Get Account Information
     print("Test 1: Get Account Information")
-    account_info = client.get_account()
+    account_info = responses["account"]
     print(f"Account Info Response: {account_info}")
     if account_info:
         print("✅ Account info retrieval successful")
@@ -45,8 +71,9 @@ def test_api_functionality():
     
     # Test 2: Get Trading Pairs
     print("\nTest 2: Get Trading Pairs")
-    pairs = client.get_trading_pairs()
-    print(f"Trading pairs response structure: {pairs.keys() if isinstance(pairs, dict) else 'Not a dictionary'}")
+    pairs = responses["pairs"]
+    pairs_by_symbol = {}
+    print(f"Trading pairs response structure: {describe_keys(pairs)}")
     
     # Analyze the response structure
     if pairs:
@@ -65,21 +92,25 @@ def test_api_functionality():
             print(f"First few trading pairs: {pairs_list[:3]}")
             print("✅ Trading pairs retrieval successful")
             
+            # Index the pairs by symbol once; Test 6 looks pairs up in it
+            pairs_by_symbol = {pair['symbol']: pair for pair in pairs_list if 'symbol' in pair}
+            
             # Check if XRP is available
-            xrp_pairs = [pair for pair in pairs_list if 'XRP-' in pair.get('symbol', '')]
-            if xrp_pairs:
-                print(f"Found XRP pairs: {[pair.get('symbol') for pair in xrp_pairs]}")
+            xrp_symbols = [symbol for symbol in pairs_by_symbol if 'XRP-' in symbol]
+            if xrp_symbols:
+                print(f"Found XRP pairs: {xrp_symbols}")
             else:
                 print("No XRP trading pairs found")
         else:
-            print(f"❌ Response has no tradable pairs. Response keys: {pairs.keys() if isinstance(pairs, dict) else 'Not a dictionary'}")
+            print(f"❌ Response has no tradable pairs. Response keys: {describe_keys(pairs)}")
     else:
         print("❌ Failed to retrieve trading pairs - null response")
     
     # Test 3: Get Holdings
     print("\nTest 3: Get Holdings")
-    holdings = client.get_holdings()
-    print(f"Holdings response structure: {holdings.keys() if isinstance(holdings, dict) else 'Not a dictionary'}")
+    holdings = responses["holdings"]
+    holdings_by_asset = {}
+    print(f"Holdings response structure: {describe_keys(holdings)}")
     
     if holdings:
         # Check for different response formats
@@ -100,10 +131,13 @@ def test_api_functionality():
                 quantity = holding.get('total_quantity', holding.get('quantity', 'unknown'))
                 print(f"  - {asset_code}: {quantity}")
             
+            # Index the holdings by asset once; the summary below reuses it
+            holdings_by_asset = {h['asset_code']: h for h in holdings_list if 'asset_code' in h}
+            
             # Check if there are any XRP holdings
-            xrp_holdings = [h for h in holdings_list if h.get('asset_code') == 'XRP']
-            if xrp_holdings:
-                print(f"Found XRP holdings: {xrp_holdings[0].get('total_quantity', xrp_holdings[0].get('quantity', 'unknown'))} XRP")
+            xrp_holding = holdings_by_asset.get('XRP')
+            if xrp_holding:
+                print(f"Found XRP holdings: {xrp_holding.get('total_quantity', xrp_holding.get('quantity', 'unknown'))} XRP")
             else:
                 print("No XRP holdings found")
                 
@@ -115,11 +149,11 @@ def test_api_functionality():
     
     # Test 4: Get Best Bid/Ask for Bitcoin
     print("\nTest 4: Get Best Bid/Ask (BTC-USD)")
-    btc_bid_ask = client.get_best_bid_ask("BTC-USD")
+    btc_bid_ask = responses["btc_bid_ask"]
     print(f"BTC-USD Bid/Ask response: {btc_bid_ask}")
     
     if btc_bid_ask:
-        print(f"Response keys: {btc_bid_ask.keys() if isinstance(btc_bid_ask, dict) else 'Not a dictionary'}")
+        print(f"Response keys: {describe_keys(btc_bid_ask)}")
         
         # Check different possible response formats
         if 'best_bid_ask' in btc_bid_ask and btc_bid_ask['best_bid_ask']:
@@ -127,15 +161,15 @@ def test_api_functionality():
             print(f"Best bid/ask data (after adaptation): {btc_bid_ask['best_bid_ask'][:1]}")
             
             # Example for using the data
-            if btc_bid_ask['best_bid_ask'][0].get('bid_price') and btc_bid_ask['best_bid_ask'][0].get('ask_price'):
-                bid = float(btc_bid_ask['best_bid_ask'][0]['bid_price'])
-                ask = float(btc_bid_ask['best_bid_ask'][0]['ask_price'])
+            bid_ask = parse_best_bid_ask(btc_bid_ask)
+            if bid_ask:
+                bid, ask = bid_ask
                 print(f"BTC-USD Bid: ${bid}, Ask: ${ask}, Spread: ${ask-bid}")
         
         # Check for error messages in the response
-        elif isinstance(btc_bid_ask, dict) and 'error' in btc_bid_ask:
+        elif 'error' in as_dict(btc_bid_ask):
             print(f"❌ API returned an error: {btc_bid_ask['error']}")
-        elif isinstance(btc_bid_ask, dict) and 'message' in btc_bid_ask:
+        elif 'message' in as_dict(btc_bid_ask):
             print(f"❌ API returned message: {btc_bid_ask['message']}")
         else:
             print("❌ Failed to retrieve best bid/ask - unexpected response format")
@@ -144,14 +178,14 @@ def test_api_functionality():
     
     # Test 5: Get Estimated Price for Bitcoin
     print("\nTest 5: Get Estimated Price (BTC-USD)")
-    btc_est_price = client.get_estimated_price("BTC-USD", "both", "0.0001")
+    btc_est_price = responses["btc_est_price"]
     print(f"BTC-USD Estimated Price response: {btc_est_price}")
     
     if btc_est_price:
-        print(f"Response keys: {btc_est_price.keys() if isinstance(btc_est_price, dict) else 'Not a dictionary'}")
+        print(f"Response keys: {describe_keys(btc_est_price)}")
         
         # Check for success patterns in the response - multiple possible formats now
-        if isinstance(btc_est_price, dict):
+        if as_dict(btc_est_price):
             if 'estimated_price' in btc_est_price:
                 print("✅ Estimated price retrieval successful")
                 print(f"Estimated price: ${btc_est_price['estimated_price']}")
@@ -198,11 +232,10 @@ def test_api_functionality():
     print("\nTest 6: Get Best Bid/Ask for XRP-USD (if available)")
     try:
         # Let's try with a different pair if XRP-USD specifically is not available
-        potential_pairs = ["XRP-USD", "XRP/USD", "XRP-USDT", "XRP-USDC"]
-        
-        for pair in potential_pairs:
-            print(f"Trying {pair}...")
-            xrp_bid_ask = client.get_best_bid_ask(pair)
+        for pair in potential_xrp_pairs:
+            listed = "" if pair in pairs_by_symbol else " (not in trading pairs)"
+            print(f"Trying {pair}{listed}...")
+            xrp_bid_ask = responses[pair]
             print(f"{pair} Bid/Ask response: {xrp_bid_ask}")
             
             if xrp_bid_ask:
@@ -210,7 +243,7 @@ def test_api_functionality():
                     print(f"✅ {pair} best bid/ask retrieval successful")
                     print(f"Response data: {xrp_bid_ask['best_bid_ask']}")
                     break
-                elif isinstance(xrp_bid_ask, dict) and ('error' in xrp_bid_ask or 'message' in xrp_bid_ask):
+                elif 'error' in as_dict(xrp_bid_ask) or 'message' in as_dict(xrp_bid_ask):
                     error_msg = xrp_bid_ask.get('error', xrp_bid_ask.get('message', 'Unknown error'))
                     print(f"❌ API error for {pair}: {error_msg}")
                 else:
@@ -223,7 +256,7 @@ def test_api_functionality():
     
     # Test 7: Get Orders
     print("\nTest 7: Get Orders")
-    orders = client.get_orders()
+    orders = responses["orders"]
     print(f"Orders: {orders}")
     if orders:
         print("✅ Orders retrieval successful")
@@ -240,32 +273,25 @@ def test_api_functionality():
     }
     
     # Extract XRP holdings if available
-    if holdings:
-        holdings_list = None
-        if 'results' in holdings:
-            holdings_list = holdings['results']
-        elif 'holdings' in holdings:
-            holdings_list = holdings['holdings']
-            
-        if holdings_list:
-            xrp_holdings = [h for h in holdings_list if h.get('asset_code') == 'XRP']
-            if xrp_holdings:
-                # Try different field names for quantity
-                quantity = xrp_holdings[0].get('total_quantity', 
-                            xrp_holdings[0].get('quantity', 
-                            xrp_holdings[0].get('quantity_available_for_trading', '0')))
-                results['xrp_holdings'] = quantity
+    xrp_holding = holdings_by_asset.get('XRP')
+    if xrp_holding:
+        # Try different field names for quantity
+        quantity = xrp_holding.get('total_quantity', 
+                    xrp_holding.get('quantity', 
+                    xrp_holding.get('quantity_available_for_trading', '0')))
+        results['xrp_holdings'] = quantity
     
-    # Extract the XRP price if available
-    if 'best_bid_ask' in xrp_bid_ask and xrp_bid_ask['best_bid_ask']:
-        best_bid_ask = xrp_bid_ask['best_bid_ask'][0]
+    # Extract the XRP price if available; the last pair tried may have had no response
+    best_bid_ask_list = as_dict(xrp_bid_ask).get('best_bid_ask')
+    if best_bid_ask_list:
+        best_bid_ask = best_bid_ask_list[0]
         # Try different formats for price
         if 'price' in best_bid_ask:
             results['xrp_price'] = best_bid_ask['price']
-        elif 'bid_price' in best_bid_ask and 'ask_price' in best_bid_ask:
-            bid_price = float(best_bid_ask['bid_price'])
-            ask_price = float(best_bid_ask['ask_price'])
-            results['xrp_price'] = str((bid_price + ask_price) / 2)
+        else:
+            bid_ask = parse_best_bid_ask(xrp_bid_ask)
+            if bid_ask:
+                results['xrp_price'] = str((bid_ask[0] + bid_ask[1]) / 2)
     
     print("\n===== API FUNCTIONALITY TESTING COMPLETE =====\n")
     return results  # Return results for further use
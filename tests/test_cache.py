@@ -0,0 +1,130 @@
+import base64
+import os
+import tempfile
+import unittest
+from unittest import mock
+from src import crypto_api_trading
+from src.cache import TTLCache, load_endpoints, save_endpoints
+from src.crypto_api_trading import ACCOUNT_PATH, BEST_BID_ASK_PATHS, HOLDINGS_PATH, CryptoAPITrading
+
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, "robinhood")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_invalidate_removes_only_one_entry(self):
+        cache = TTLCache(self.directory)
+        cache.set("a", {"value": 1}, 60)
+        cache.set("b", {"value": 2}, 60)
+
+        cache.invalidate("a")
+        cache.invalidate("missing")
+
+        # A fresh cache reads the surviving entry back from disk
+        reloaded = TTLCache(self.directory)
+        self.assertIsNone(reloaded.get("a"))
+        self.assertEqual(reloaded.get("b"), {"value": 2})
+
+    def test_make_key_scope(self):
+        path = "/api/v1/crypto/trading/holdings/?asset_code=XRP&asset_code=BTC"
+        reordered = "/api/v1/crypto/trading/holdings/?asset_code=BTC&asset_code=XRP"
+        self.assertEqual(TTLCache.make_key(path, "key-1"), TTLCache.make_key(reordered, "key-1"))
+        self.assertNotEqual(TTLCache.make_key(path, "key-1"), TTLCache.make_key(path, "key-2"))
+
+
+class TestOrderInvalidation(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = TTLCache(os.path.join(self.tmp.name, "robinhood"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_client(self, api_key: str) -> CryptoAPITrading:
+        """Create a client that never touches the network or the shared endpoint map"""
+        with mock.patch("src.crypto_api_trading.BASE64_PRIVATE_KEY", base64.b64encode(bytes(32)).decode()), \
+                mock.patch("src.crypto_api_trading.load_endpoints", return_value={}):
+            client = CryptoAPITrading(cache=self.cache)
+        client.api_key = api_key
+        return client
+
+    def test_orders_drop_balances_but_keep_trading_pairs(self):
+        client = self.make_client("key-1")
+        pairs_path = "/api/v1/crypto/trading/trading_pairs/"
+        holdings_xrp_path = f"{HOLDINGS_PATH}?asset_code=XRP"
+        for path in (ACCOUNT_PATH, HOLDINGS_PATH, holdings_xrp_path, pairs_path):
+            self.cache.set(client._cache_key(path), {"path": path}, 60)
+
+        with mock.patch.object(client, "make_api_request", return_value={"id": "1"}):
+            client.get_holdings("XRP")
+            client.place_order("id", "buy", "market", "XRP-USD", {"asset_quantity": "1"})
+
+        for path in (ACCOUNT_PATH, HOLDINGS_PATH, holdings_xrp_path):
+            self.assertIsNone(self.cache.get(client._cache_key(path)))
+        self.assertEqual(self.cache.get(client._cache_key(pairs_path)), {"path": pairs_path})
+
+    def test_uncached_balance_reads_skip_cache(self):
+        client = self.make_client("key-1")
+        holdings_xrp_path = f"{HOLDINGS_PATH}?asset_code=XRP"
+        for path in (ACCOUNT_PATH, holdings_xrp_path):
+            self.cache.set(client._cache_key(path), {"stale": True}, 60)
+
+        response = mock.Mock(status=200, data=b'{"fresh": true}')
+        with mock.patch.object(client.pool, "request", return_value=response) as request:
+            self.assertEqual(client.get_account(), {"stale": True})
+            self.assertEqual(client.get_holdings("XRP"), {"stale": True})
+            request.assert_not_called()
+
+            self.assertEqual(client.get_account(cached=False), {"fresh": True})
+            self.assertEqual(client.get_holdings("XRP", cached=False), {"fresh": True})
+            self.assertEqual(request.call_count, 2)
+
+    def test_api_keys_do_not_share_entries(self):
+        first, second = self.make_client("key-1"), self.make_client("key-2")
+        self.cache.set(first._cache_key(ACCOUNT_PATH), {"account": 1}, 60)
+        self.assertIsNone(self.cache.get(second._cache_key(ACCOUNT_PATH)))
+
+
+class TestLearnedEndpoints(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "endpoints.json")
+        patches = [
+            mock.patch.object(crypto_api_trading, "load_endpoints", lambda: load_endpoints(self.path)),
+            mock.patch.object(crypto_api_trading, "save_endpoints", lambda endpoints: save_endpoints(endpoints, self.path)),
+            mock.patch.object(crypto_api_trading, "BASE64_PRIVATE_KEY", base64.b64encode(bytes(32)).decode()),
+            mock.patch.dict(crypto_api_trading._learned_endpoints, clear=True),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_clients_register_no_exit_hooks(self):
+        with mock.patch("atexit.register") as register:
+            CryptoAPITrading(cache=TTLCache(None))
+        register.assert_not_called()
+
+    def test_close_merges_into_saved_map(self):
+        save_endpoints({"est_price": "/saved/by/another/process/"}, self.path)
+        learner, idle = CryptoAPITrading(cache=TTLCache(None)), CryptoAPITrading(cache=TTLCache(None))
+        with mock.patch.object(learner, "make_api_request", return_value={"best_bid_ask": []}):
+            learner.get_best_bid_ask("XRP-USD")
+
+        learner.close()
+        idle.close()
+
+        self.assertEqual(load_endpoints(self.path), {
+            "est_price": "/saved/by/another/process/",
+            "bid_ask": BEST_BID_ASK_PATHS[0],
+        })
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import base64
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
+import urllib3
+from src import crypto_api_trading
+from src.cache import TTLCache
+from src.crypto_api_trading import CryptoAPITrading
+
+
+class TestFetchConcurrently(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.object(crypto_api_trading, "BASE64_PRIVATE_KEY", base64.b64encode(bytes(32)).decode()), \
+                mock.patch.object(crypto_api_trading, "load_endpoints", return_value={}):
+            self.client = CryptoAPITrading(cache=TTLCache(None))
+
+    def tearDown(self):
+        self.client.pool.close()
+
+    def test_failed_call_returns_none(self):
+        def fail():
+            raise ConnectionError("connection reset")
+
+        with self.assertLogs(crypto_api_trading.logger, "ERROR"):
+            results = self.client.fetch_concurrently({
+                "account": (lambda: {"id": "1"}, ()),
+                "price": (fail, ()),
+                "pairs": (lambda *symbols: {"results": list(symbols)}, ("XRP-USD",)),
+            })
+
+        self.assertEqual(results, {"account": {"id": "1"}, "price": None, "pairs": {"results": ["XRP-USD"]}})
+
+    def test_no_calls(self):
+        self.assertEqual(self.client.fetch_concurrently({}), {})
+
+
+class UnavailableHandler(BaseHTTPRequestHandler):
+    """Answer every request with a 503 and a JSON error body"""
+
+    def do_GET(self):
+        body = b'{"errors": [{"detail": "unavailable"}]}'
+        self.send_response(503)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestRetries(unittest.TestCase):
+    def setUp(self):
+        self.server = HTTPServer(("127.0.0.1", 0), UnavailableHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        with mock.patch.object(crypto_api_trading, "API_KEY", "key-1"), \
+                mock.patch.object(crypto_api_trading, "BASE64_PRIVATE_KEY", base64.b64encode(bytes(32)).decode()), \
+                mock.patch.object(crypto_api_trading, "load_endpoints", return_value={}):
+            self.client = CryptoAPITrading(cache=TTLCache(None))
+        self.client.pool.close()
+        # Same retry policy, pointed at the local server without the backoff sleeps
+        retries = self.client.pool.retries.new(backoff_factor=0)
+        self.client.pool = urllib3.connection_from_url(f"http://127.0.0.1:{self.server.server_port}",
+                                                       retries=retries, timeout=5)
+        self.addCleanup(self.client.pool.close)
+
+    def test_exhausted_retries_return_error_body(self):
+        with self.assertLogs(crypto_api_trading.logger, "WARNING"):
+            result = self.client.make_api_request("GET", "/api/v1/crypto/trading/accounts/")
+        self.assertEqual(result, {"errors": [{"detail": "unavailable"}]})
+
+
+if __name__ == "__main__":
+    unittest.main()
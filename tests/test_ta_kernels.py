@@ -0,0 +1,46 @@
+import unittest
+import numpy as np
+from src import _ta_kernels as ta
+
+
+class TestBatchKernels(unittest.TestCase):
+    """The loop kernels (compiled when numba is installed) and their NumPy fallbacks must agree"""
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.prices = 0.5 * np.cumprod(1 + rng.normal(0, 0.01, 200))
+
+    def test_ema_final(self):
+        for dtype in (np.float32, np.float64):
+            prices = self.prices.astype(dtype)
+            for period in (1, 9, 50, 200):
+                k = 2 / (period + 1)
+                np.testing.assert_allclose(ta._ema_final_numpy(prices, period, k),
+                                           ta._ema_final_loop(prices, period, k), rtol=1e-12,
+                                           err_msg=f"{dtype.__name__} period {period}")
+
+    def test_pct_change_std(self):
+        for dtype in (np.float32, np.float64):
+            prices = self.prices.astype(dtype)
+            for window in (2, 20, 200):
+                np.testing.assert_allclose(ta._pct_change_std_numpy(prices[-window:]),
+                                           ta._pct_change_std_loop(prices[-window:]), rtol=1e-10,
+                                           err_msg=f"{dtype.__name__} window {window}")
+
+
+class TestTradeSummary(unittest.TestCase):
+    def test_compiled_and_python_paths_agree(self):
+        # Buys have NaN profit; sells win, lose, break even or have an unknown P&L
+        trade_types = np.array([0, 1, 0, 1, 1, 0, 1, 1], dtype=np.int8)
+        profits = np.array([np.nan, 1.5, np.nan, -0.25, 0.0, np.nan, 2.0, np.nan])
+        expected = (5, 2, 1, 3.5, -0.25)
+
+        # py_func is the undecorated function numba compiles; without numba they are the same
+        for kernel in (ta.trade_summary, getattr(ta.trade_summary, "py_func", ta.trade_summary)):
+            summary = kernel(trade_types, profits, 1)
+            self.assertEqual(summary, expected)
+            self.assertEqual([type(value) for value in summary], [int, int, int, float, float])
+
+
+if __name__ == "__main__":
+    unittest.main()
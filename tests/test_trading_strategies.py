@@ -0,0 +1,58 @@
+import unittest
+from typing import Optional
+from unittest import mock
+import numpy as np
+from src.trading_strategies import PriceFeed, RSIStrategy
+
+
+def wilder_rsi(prices: np.ndarray, period: int) -> Optional[float]:
+    """
+    Reference Wilder RSI: seed the averages with the simple mean of the first period
+    changes, then smooth each later change in. None until period + 1 prices are known.
+    """
+    if len(prices) < period + 1:
+        return None
+    deltas = np.diff(prices)
+    gains, losses = np.maximum(deltas, 0.0), np.maximum(-deltas, 0.0)
+    avg_gain, avg_loss = gains[:period].mean(), losses[:period].mean()
+    for gain, loss in zip(gains[period:], losses[period:]):
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+    if avg_loss == 0:
+        return 100.0
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+class TestRSIStrategy(unittest.TestCase):
+    def make_strategy(self):
+        """Create an RSI strategy on a shared feed whose quotes the test sets directly"""
+        feed = PriceFeed(mock.Mock())
+        return RSIStrategy(feed.client, "BTC-USD", "0.001", price_feed=feed), feed
+
+    def check_against_reference(self, prices: np.ndarray):
+        strategy, feed = self.make_strategy()
+        for tick in range(1, len(prices) + 1):
+            feed.quotes = {"BTC-USD": (prices[tick - 1] - 1.0, prices[tick - 1])}
+            self.assertEqual(strategy.collect_price_data(), prices[tick - 1])
+
+            expected = wilder_rsi(prices[:tick], strategy.rsi_period)
+            rsi = strategy.calculate_rsi()
+            if expected is None:
+                self.assertIsNone(rsi, f"tick {tick}")
+            else:
+                # The seeding tick is the first one with a value
+                self.assertAlmostEqual(rsi, expected, places=9, msg=f"tick {tick}")
+
+    def test_random_walk(self):
+        # Long enough for the ring buffer to wrap around several times
+        rng = np.random.default_rng(13)
+        self.check_against_reference(30000 * np.cumprod(1 + rng.normal(0, 0.01, 300)))
+
+    def test_rising_then_falling(self):
+        # Only gains up to the seeding step (RSI 100), then only losses
+        prices = np.concatenate((np.linspace(100.0, 130.0, 20), np.linspace(129.0, 90.0, 30)))
+        self.check_against_reference(prices)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,285 @@
+import contextlib
+import io
+import unittest
+from datetime import datetime
+from typing import List
+from unittest import mock
+import numpy as np
+from src import xrp_trading
+from src.xrp_trading import XRPTradingStrategy
+
+
+def make_strategy():
+    """Create a strategy whose client returns whatever quote the test sets"""
+    client = mock.Mock()
+    return XRPTradingStrategy(client, "XRP-USD", "10"), client
+
+
+def feed_price(strategy: XRPTradingStrategy, client: mock.Mock, price: float) -> None:
+    """Record one price through the strategy's normal quote parsing"""
+    client.get_best_bid_ask.return_value = {
+        "best_bid_ask": [{"bid_price": str(price), "ask_price": str(price)}]
+    }
+    strategy.collect_price_data()
+
+
+def random_walk(n: int, seed: int = 7, sigma: float = 0.01) -> np.ndarray:
+    """Seeded random walk around the XRP price, rounded to the strategy's buffer precision"""
+    rng = np.random.default_rng(seed)
+    prices = 0.5 * np.cumprod(1 + rng.normal(0, sigma, n))
+    return prices.astype(xrp_trading.PRICE_DTYPE).astype(np.float64)
+
+
+# Reference indicators computed directly from the whole price history
+
+def ref_ema(prices: np.ndarray, period: int) -> float:
+    """EMA seeded with the simple average of the first period prices; the latest price if too few"""
+    if len(prices) < period:
+        return float(prices[-1]) if len(prices) else 0.0
+    k = 2 / (period + 1)
+    ema = prices[:period].mean()
+    for price in prices[period:]:
+        ema = price * k + ema * (1 - k)
+    return float(ema)
+
+
+def ref_rsi(prices: np.ndarray, period: int) -> float:
+    """Wilder's RSI seeded with the simple average of the first period changes; 50 if too few"""
+    if len(prices) < period + 1:
+        return 50.0
+    deltas = np.diff(prices)
+    gains, losses = np.maximum(deltas, 0.0), np.maximum(-deltas, 0.0)
+    avg_gain, avg_loss = gains[:period].mean(), losses[:period].mean()
+    for gain, loss in zip(gains[period:], losses[period:]):
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+    if avg_loss == 0:
+        return 100.0
+    return float(100 - 100 / (1 + avg_gain / avg_loss))
+
+
+def ref_macd(prices: np.ndarray, fast: int, slow: int, signal_period: int, first_tick: int) -> List[float]:
+    """
+    MACD, signal and histogram for the latest price. The signal EMA covers the MACD values
+    from first_tick prices onwards (when the strategy started computing them) and equals
+    the MACD until signal_period values have been seen.
+    """
+    macds = np.array([ref_ema(prices[:t], fast) - ref_ema(prices[:t], slow)
+                      for t in range(first_tick, len(prices) + 1)])
+    macd = macds[-1]
+    signal = ref_ema(macds, signal_period) if len(macds) >= signal_period else macd
+    return [macd, signal, macd - signal]
+
+
+def ref_bollinger(prices: np.ndarray, period: int, num_std: float) -> List[float]:
+    """Upper, middle and lower bands over the last period prices; all the latest price if too few"""
+    if len(prices) < period:
+        last = float(prices[-1]) if len(prices) else 0.0
+        return [last, last, last]
+    window = prices[-period:]
+    middle, std = window.mean(), window.std()
+    return [middle + num_std * std, middle, middle - num_std * std]
+
+
+def ref_volatility(prices: np.ndarray, window: int) -> float:
+    """Population standard deviation of the percentage changes over the last window prices"""
+    if len(prices) < window + 1:
+        return 0.0
+    recent = prices[-window:]
+    return float(np.std(np.diff(recent) / recent[:-1] * 100))
+
+
+class TestIndicatorsMatchReference(unittest.TestCase):
+    """The streaming indicator state must agree with the batch formulas on every tick"""
+
+    TICKS = 300
+
+    # A standard deviation taken from running sums carries rounding error of about
+    # sqrt(machine epsilon) times the scale of the values, so a zero volatility comes out
+    # around 1e-8 percent
+    VOLATILITY_ATOL = 1e-6
+
+    def assert_close(self, actual, expected, what: str, tick: int, atol: float = 1e-10):
+        np.testing.assert_allclose(actual, expected, rtol=1e-8, atol=atol, err_msg=f"{what} at tick {tick}")
+
+    def check_indicator_helpers(self, prices: np.ndarray):
+        """Record prices one at a time and compare every calculate_* helper after each one"""
+        s, client = make_strategy()
+        macd_start = s.macd_slow + s.macd_signal
+        for tick in range(1, len(prices) + 1):
+            feed_price(s, client, prices[tick - 1])
+            history = prices[:tick]
+
+            self.assert_close(s.calculate_rsi(), ref_rsi(history, s.rsi_period), "RSI", tick)
+
+            macd = s.calculate_macd()
+            expected_macd = [0, 0, 0]
+            if tick >= macd_start:
+                expected_macd = ref_macd(history, s.macd_fast, s.macd_slow, s.macd_signal, macd_start)
+            self.assert_close([macd["macd"], macd["signal"], macd["histogram"]], expected_macd, "MACD", tick)
+
+            bands = s.calculate_bollinger_bands()
+            self.assert_close([bands["upper"], bands["middle"], bands["lower"]],
+                              ref_bollinger(history, s.bb_period, s.bb_std_dev), "Bollinger bands", tick)
+
+            emas = s.calculate_emas()
+            expected_emas = [ref_ema(history, period) for period in (s.ema_short, s.ema_medium, s.ema_long)]
+            self.assert_close([emas["short"], emas["medium"], emas["long"]], expected_emas, "EMAs", tick)
+
+            expected_volatility = ref_volatility(history, s.volatility_window)
+            self.assert_close(s.calculate_volatility(), expected_volatility, "volatility", tick,
+                              self.VOLATILITY_ATOL)
+            if tick > s.volatility_window:
+                self.assert_close(s.calculate_volatility(s.prices_view()), expected_volatility,
+                                  "volatility of explicit prices", tick)
+
+    def test_indicator_helpers(self):
+        self.check_indicator_helpers(random_walk(self.TICKS))
+
+    def test_indicator_helpers_with_frequent_resync(self):
+        # Resynchronizing the running sums must not change the results
+        with mock.patch.object(xrp_trading, "SUM_RESYNC_INTERVAL", 7):
+            self.check_indicator_helpers(random_walk(self.TICKS, seed=11))
+
+    def test_indicator_helpers_with_flat_prices(self):
+        # Rising prices have no losses, so the RSI saturates at 100; once the Bollinger window
+        # only holds the repeated price the bands collapse onto it and the volatility is 0
+        prices = np.concatenate((np.linspace(0.5, 0.6, 40), np.full(40, 0.625)))
+        prices = prices.astype(xrp_trading.PRICE_DTYPE).astype(np.float64)
+        self.check_indicator_helpers(prices)
+
+    def test_analyze_market(self):
+        # Every tick is recorded and analyzed, even the ones that reuse the previous signal
+        s, client = make_strategy()
+        prices = random_walk(self.TICKS, seed=5)
+        for tick in range(1, len(prices) + 1):
+            client.get_best_bid_ask.return_value = {
+                "best_bid_ask": [{"bid_price": str(prices[tick - 1]), "ask_price": str(prices[tick - 1])}]
+            }
+            analysis = s.analyze_market()
+            if tick < s.min_data_points:
+                self.assertEqual(analysis.signal, "insufficient_data")
+                self.assertFalse(analysis.has_indicators)
+                continue
+
+            history = prices[:tick]
+            self.assertTrue(analysis.has_indicators)
+            self.assert_close(analysis.rsi, ref_rsi(history, s.rsi_period), "RSI", tick)
+            # The fused kernel starts the MACD signal at the first analyzed tick
+            self.assert_close([analysis.macd, analysis.macd_signal, analysis.macd_hist],
+                              ref_macd(history, s.macd_fast, s.macd_slow, s.macd_signal, s.min_data_points),
+                              "MACD", tick)
+            self.assert_close([analysis.bb_upper, analysis.bb_mid, analysis.bb_lower],
+                              ref_bollinger(history, s.bb_period, s.bb_std_dev), "Bollinger bands", tick)
+            self.assert_close([analysis.ema_short, analysis.ema_medium, analysis.ema_long],
+                              [ref_ema(history, period) for period in (s.ema_short, s.ema_medium, s.ema_long)],
+                              "EMAs", tick)
+            self.assert_close(analysis.volatility, ref_volatility(history, s.volatility_window), "volatility", tick,
+                              self.VOLATILITY_ATOL)
+
+
+class TestSignalReuse(unittest.TestCase):
+    def test_small_moves_reuse_signal_but_record_tick(self):
+        strategy, client = make_strategy()
+        prices = random_walk(strategy.min_data_points)
+        for price in prices[:-1]:
+            feed_price(strategy, client, price)
+        client.get_best_bid_ask.return_value = {
+            "best_bid_ask": [{"bid_price": str(prices[-1]), "ask_price": str(prices[-1])}]
+        }
+        scored = strategy.analyze_market()
+        self.assertTrue(scored.has_indicators)
+
+        # Half of min_tick away from the scored price: the tick is recorded and the indicators
+        # move, but the signal is reused without scoring
+        price = scored.price * (1 + strategy.min_tick / 2)
+        client.get_best_bid_ask.return_value = {"best_bid_ask": [{"bid_price": str(price), "ask_price": str(price)}]}
+        with mock.patch.object(xrp_trading, "_fired_reasons") as fired_reasons:
+            reused = strategy.analyze_market()
+        fired_reasons.assert_not_called()
+        self.assertEqual(strategy._price_count, len(prices) + 1)
+        self.assertEqual(reused.price, price)
+        self.assertNotEqual(reused.rsi, scored.rsi)
+        self.assertEqual(reused[1:6], scored[1:6])
+
+        # A position change always rescores
+        strategy.position_size = 10
+        with mock.patch.object(xrp_trading, "_fired_reasons", return_value=[]) as fired_reasons:
+            strategy.analyze_market()
+        self.assertEqual(fired_reasons.call_count, 2)
+
+
+class TestEMAWarmup(unittest.TestCase):
+    """EMA and trend helpers during the warm-up, before the long EMA has enough prices"""
+
+    def test_emas_before_long_period(self):
+        strategy, client = make_strategy()
+        for count in range(strategy.ema_long):
+            emas = strategy.calculate_emas()
+            explicit = strategy.calculate_emas(strategy.prices_view())
+            self.assertEqual(emas, explicit)
+            if count == 0:
+                self.assertEqual(emas, {"short": 0.0, "medium": 0.0, "long": 0.0})
+            else:
+                # Too few prices for the long EMA, so it falls back to the latest price
+                self.assertAlmostEqual(emas["long"], float(strategy.price_history[-1]))
+            self.assertEqual(strategy.detect_trend(), "unknown")
+            feed_price(strategy, client, 0.5 + count * 0.001)
+
+    def test_calculate_ema_short_inputs(self):
+        strategy, _ = make_strategy()
+        self.assertEqual(strategy.calculate_ema(9, np.empty(0)), 0.0)
+        self.assertEqual(strategy.calculate_ema(9, np.array([0.4, 0.5])), 0.5)
+        self.assertIsInstance(strategy.calculate_ema(9, np.array([0.4, 0.5], dtype=np.float32)), float)
+
+
+class TestVolatilityInputs(unittest.TestCase):
+    def test_short_explicit_prices_after_warmup(self):
+        strategy, client = make_strategy()
+        for price in random_walk(60):
+            feed_price(strategy, client, price)
+        window = strategy.volatility_window
+        prices = strategy.prices_view()
+
+        # An explicit array is judged by its own length, not by how many prices were recorded
+        self.assertEqual(strategy.calculate_volatility(prices[-window:]), 0)
+        self.assertEqual(strategy.calculate_volatility(prices[:2]), 0)
+        self.assertAlmostEqual(strategy.calculate_volatility(prices[-(window + 1):]),
+                               ref_volatility(prices.astype(np.float64), window), places=9)
+
+class TestHistories(unittest.TestCase):
+    def test_histories_are_lists(self):
+        strategy, client = make_strategy()
+        self.assertEqual(strategy.price_history, [])
+        self.assertEqual(strategy.time_history, [])
+
+        prices = random_walk(strategy.min_data_points + 5)
+        for price in prices:
+            feed_price(strategy, client, price)
+
+        history = strategy.price_history
+        self.assertIsInstance(history, list)
+        self.assertEqual(history, prices[-strategy.min_data_points:].tolist())
+        times = strategy.time_history
+        self.assertEqual(len(times), strategy.min_data_points)
+        self.assertIsInstance(times[0], datetime)
+        self.assertEqual(times, sorted(times))
+
+class TestExecuteOutput(unittest.TestCase):
+    def test_error_traceback_stays_in_cycle_output(self):
+        strategy, _ = make_strategy()
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with mock.patch.object(strategy, "analyze_market", side_effect=RuntimeError("quote failed")), \
+                contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            strategy.execute()
+
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual(stderr.getvalue(), "")
+        self.assertIn("Error during strategy execution: quote failed", lines)
+        self.assertLess(lines.index("Error during strategy execution: quote failed"),
+                        lines.index("Traceback (most recent call last):"))
+        self.assertEqual(lines[-2:], ["RuntimeError: quote failed", "Continuing to next cycle..."])
+
+
+if __name__ == "__main__":
+    unittest.main()